@@ -1,16 +1,105 @@
-from .src.variables import apply_variables
-from .src.fields import split_fields
-from .src.block import BlockData, PartialBlockData
-from .src.parser import parse_field, parse_code
-from .src.evaluator import generate_timeline, evaluate_schedule
-
-__all__ = [
-    "apply_variables",
-    "split_fields",
-    "BlockData",
-    "PartialBlockData",
-    "parse_field",
-    "parse_code",
-    "generate_timeline",
-    "evaluate_schedule",
-]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .src.variables import (
+        apply_variables,
+        Template,
+        compile_template,
+        render,
+        render_many,
+        get_template,
+        referenced_variables,
+        LazyVariables,
+        VariableIndex,
+    )
+    from .src.fields import Field, split_fields
+    from .src.block import Block, BlockData, PartialBlockData, ScheduleEntry
+    from .src.parser import parse_field, parse_code, parse_block
+    from .src.date import parse_date_string, set_date_languages
+    from .src.zone import Zone, get_zone
+    from .src.evaluator import (
+        generate_timeline,
+        evaluate_schedule,
+        evaluate_schedule_many,
+        validate_schedule,
+        CompiledSchedule,
+        Transition,
+        next_transition,
+        upcoming_transitions,
+    )
+    from .src.bulk import BlockEvaluation, evaluate_blocks, shutdown_pools
+    from .src.index import ScheduleIndex
+    from .src.document import BlockHandle, parse_document
+    from .src.parse_cache import ParsedBlockCache
+    from .src.incremental import TextEdit, ParseState, parse_code_state, reparse_code
+    from .src.scheduler import Scheduler, ManualClock, SystemClock
+    from .src.codec import encode_block, decode_block, encode_schedule, decode_schedule
+
+# Public names by the module they live in. Modules are only imported once one
+# of their names is accessed, so parsing blocks never pulls in `dateparser`
+_EXPORTS = {
+    "apply_variables": ".src.variables",
+    "Template": ".src.variables",
+    "compile_template": ".src.variables",
+    "render": ".src.variables",
+    "render_many": ".src.variables",
+    "get_template": ".src.variables",
+    "referenced_variables": ".src.variables",
+    "LazyVariables": ".src.variables",
+    "VariableIndex": ".src.variables",
+    "Field": ".src.fields",
+    "split_fields": ".src.fields",
+    "Block": ".src.block",
+    "BlockData": ".src.block",
+    "PartialBlockData": ".src.block",
+    "ScheduleEntry": ".src.block",
+    "parse_field": ".src.parser",
+    "parse_code": ".src.parser",
+    "parse_block": ".src.parser",
+    "parse_date_string": ".src.date",
+    "set_date_languages": ".src.date",
+    "Zone": ".src.zone",
+    "get_zone": ".src.zone",
+    "generate_timeline": ".src.evaluator",
+    "evaluate_schedule": ".src.evaluator",
+    "evaluate_schedule_many": ".src.evaluator",
+    "validate_schedule": ".src.evaluator",
+    "CompiledSchedule": ".src.evaluator",
+    "Transition": ".src.evaluator",
+    "next_transition": ".src.evaluator",
+    "upcoming_transitions": ".src.evaluator",
+    "BlockEvaluation": ".src.bulk",
+    "evaluate_blocks": ".src.bulk",
+    "shutdown_pools": ".src.bulk",
+    "ScheduleIndex": ".src.index",
+    "BlockHandle": ".src.document",
+    "parse_document": ".src.document",
+    "ParsedBlockCache": ".src.parse_cache",
+    "TextEdit": ".src.incremental",
+    "ParseState": ".src.incremental",
+    "parse_code_state": ".src.incremental",
+    "reparse_code": ".src.incremental",
+    "Scheduler": ".src.scheduler",
+    "ManualClock": ".src.scheduler",
+    "SystemClock": ".src.scheduler",
+    "encode_block": ".src.codec",
+    "decode_block": ".src.codec",
+    "encode_schedule": ".src.codec",
+    "decode_schedule": ".src.codec",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -1,3 +1,5 @@
+import sys
+import dataclasses
 from typing import TypedDict, Literal
 
 Action = Literal["set", "end"]
@@ -20,3 +22,51 @@ class BlockData(TypedDict, total=True):
     tasks: list[str] | None
     timezone: str | None
     schedule: list[ScheduleEntry]
+
+
+def _intern(value: str | None) -> str | None:
+    return None if value is None else sys.intern(value)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Block:
+    """
+    Compact, immutable form of `BlockData` for keeping many blocks in memory.
+
+    Tags, timezones and schedule dates repeat across blocks, so they are
+    interned, and the collections are immutable tuples and frozensets.
+    """
+
+    title: str
+    notes: str | None
+    tags: frozenset[str] | None
+    tasks: tuple[str, ...] | None
+    timezone: str | None
+    schedule: tuple[ScheduleEntry, ...]
+
+    @classmethod
+    def from_data(cls, block_data: BlockData) -> "Block":
+        tags = block_data["tags"]
+        tasks = block_data["tasks"]
+
+        return cls(
+            title=block_data["title"],
+            notes=block_data["notes"],
+            tags=None if tags is None else frozenset(map(sys.intern, tags)),
+            tasks=None if tasks is None else tuple(tasks),
+            timezone=_intern(block_data["timezone"]),
+            schedule=tuple(
+                (action, _intern(date_string))
+                for action, date_string in block_data["schedule"]
+            ),
+        )
+
+    def to_data(self) -> BlockData:
+        return {
+            "title": self.title,
+            "notes": self.notes,
+            "tags": None if self.tags is None else set(self.tags),
+            "tasks": None if self.tasks is None else list(self.tasks),
+            "timezone": self.timezone,
+            "schedule": list(self.schedule),
+        }
@@ -0,0 +1,160 @@
+import os
+import datetime
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TypedDict
+from .block import BlockData
+from .parser import parse_code
+from .evaluator import evaluate_schedule
+
+BlockSource = tuple[str, dict[str, str]]
+
+
+class BlockEvaluation(TypedDict):
+    block: BlockData | None
+    evaluation: bool
+    matched_date: datetime.datetime | None
+    error: Exception | None
+
+
+# Process pools by worker count, kept between calls so every worker's imports
+# and date caches stay warm
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+
+        return pool
+
+
+def _discard_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools() -> None:
+    """Shut down the process pools `evaluate_blocks` keeps between calls."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.shutdown()
+
+
+def _evaluate_block(
+    code: str,
+    variables: dict[str, str],
+    evaluation_date: datetime.datetime,
+    relative_base: datetime.datetime,
+) -> BlockEvaluation:
+    try:
+        block_data = parse_code(code, variables)
+        evaluation, matched_date = evaluate_schedule(
+            block_data["schedule"],
+            relative_base=relative_base,
+            evaluation_date=evaluation_date,
+            timezone=block_data["timezone"],
+        )
+    except Exception as error:
+        return {
+            "block": None,
+            "evaluation": False,
+            "matched_date": None,
+            "error": error,
+        }
+
+    return {
+        "block": block_data,
+        "evaluation": evaluation,
+        "matched_date": matched_date,
+        "error": None,
+    }
+
+
+def _evaluate_shard(
+    shard: list[BlockSource],
+    evaluation_date: datetime.datetime,
+    relative_base: datetime.datetime,
+) -> list[BlockEvaluation]:
+    # Runs inside a worker process, whose module-level date cache stays warm
+    # for every shard the process is handed
+    return [
+        _evaluate_block(code, variables, evaluation_date, relative_base)
+        for code, variables in shard
+    ]
+
+
+def evaluate_blocks(
+    blocks: list[BlockSource],
+    evaluation_date: datetime.datetime,
+    *,
+    relative_base: datetime.datetime | None = None,
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[BlockEvaluation]:
+    """
+    Parse and evaluate `(code, variables)` blocks, in input order.
+
+    Errors are captured per block instead of raised. Blocks are sharded across
+    a process pool with `workers` processes (all cores by default), which is
+    kept for later calls with the same `workers` so the worker date caches
+    stay warm until `shutdown_pools`. Pass `workers=1` to evaluate in this
+    process, or an `executor` to use instead.
+    """
+
+    if relative_base is None:
+        relative_base = evaluation_date
+
+    workers = workers or os.cpu_count() or 1
+
+    if executor is None and (workers == 1 or len(blocks) <= 1):
+        return _evaluate_shard(blocks, evaluation_date, relative_base)
+
+    # A few shards per worker keeps the processes busy when shards are uneven
+    shard_size = max(1, -(-len(blocks) // (workers * 4)))
+    shards = [
+        blocks[start : start + shard_size]
+        for start in range(0, len(blocks), shard_size)
+    ]
+
+    if executor is not None:
+        return _map_shards(executor, shards, evaluation_date, relative_base)
+
+    pool = _get_pool(workers)
+
+    try:
+        return _map_shards(pool, shards, evaluation_date, relative_base)
+    except BrokenProcessPool:
+        # A worker died, so the next call starts over with a new pool
+        _discard_pool(workers, pool)
+        raise
+
+
+def _map_shards(
+    executor: Executor,
+    shards: list[list[BlockSource]],
+    evaluation_date: datetime.datetime,
+    relative_base: datetime.datetime,
+) -> list[BlockEvaluation]:
+    results: list[BlockEvaluation] = []
+
+    for shard_results in executor.map(
+        _evaluate_shard,
+        shards,
+        [evaluation_date] * len(shards),
+        [relative_base] * len(shards),
+    ):
+        results.extend(shard_results)
+
+    return results
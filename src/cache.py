@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class LRUCache[K: Hashable, V]:
+    """
+    Bounded least-recently-used cache with an optional time-to-live.
+
+    `maxsize` and `ttl` (in seconds) can be changed at any time; shrinking
+    `maxsize` evicts the oldest entries right away.
+    """
+
+    def __init__(self, maxsize: int = 1024, *, ttl: float | None = None) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize cannot be negative")
+
+        self._maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize cannot be negative")
+
+        self._maxsize = maxsize
+        self._shrink()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry[1])
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, stored_at = entry
+
+        if self._is_expired(stored_at):
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        self._shrink()
+
+    def pop(self, key: K) -> V | None:
+        entry = self._entries.pop(key, None)
+        return None if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def _shrink(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
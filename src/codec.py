@@ -0,0 +1,216 @@
+import sys
+import array
+from typing import cast
+from .block import BlockData, ScheduleEntry
+from .evaluator import CompiledSchedule
+
+# Every payload starts with the magic, the format version and its kind
+MAGIC = b"WDE"
+VERSION = 1
+
+_BLOCK = ord("B")
+_SCHEDULE = ord("S")
+
+# Optional values are prefixed with whether they are present
+_ABSENT = 0
+_PRESENT = 1
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+
+def _write_str(buffer: bytearray, value: str) -> None:
+    data = value.encode()
+    _write_varint(buffer, len(data))
+    buffer += data
+
+
+def _write_optional_str(buffer: bytearray, value: str | None) -> None:
+    if value is None:
+        buffer.append(_ABSENT)
+    else:
+        buffer.append(_PRESENT)
+        _write_str(buffer, value)
+
+
+def _write_optional_strs(buffer: bytearray, values: list[str] | None) -> None:
+    if values is None:
+        buffer.append(_ABSENT)
+        return
+
+    buffer.append(_PRESENT)
+    _write_varint(buffer, len(values))
+
+    for value in values:
+        _write_str(buffer, value)
+
+
+def _write_array(buffer: bytearray, values: "array.array[int]") -> None:
+    # Arrays are stored little-endian whatever the machine's byte order is
+    if sys.byteorder == "big":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+
+    buffer += values.tobytes()
+
+
+def _write_header(buffer: bytearray, kind: int) -> None:
+    buffer += MAGIC
+    buffer.append(VERSION)
+    buffer.append(kind)
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def read_bytes(self, size: int) -> memoryview:
+        end = self.offset + size
+
+        if end > len(self.data):
+            raise ValueError("Encoded data is truncated")
+
+        chunk = self.data[self.offset : end]
+        self.offset = end
+        return chunk
+
+    def read_byte(self) -> int:
+        return self.read_bytes(1)[0]
+
+    def read_varint(self) -> int:
+        value = 0
+        shift = 0
+
+        while True:
+            byte = self.read_byte()
+            value |= (byte & 0x7F) << shift
+            shift += 7
+
+            if byte < 0x80:
+                return value
+
+    def read_str(self) -> str:
+        return str(self.read_bytes(self.read_varint()), "utf-8")
+
+    def read_optional_str(self) -> str | None:
+        return self.read_str() if self.read_present() else None
+
+    def read_optional_strs(self) -> list[str] | None:
+        if not self.read_present():
+            return None
+
+        return [self.read_str() for _ in range(self.read_varint())]
+
+    def read_present(self) -> bool:
+        flag = self.read_byte()
+
+        if flag not in (_ABSENT, _PRESENT):
+            raise ValueError(f"Invalid presence flag: {flag}")
+
+        return flag == _PRESENT
+
+    def read_array(self, typecode: str, length: int) -> "array.array[int]":
+        values = array.array(typecode)
+        values.frombytes(self.read_bytes(length * values.itemsize))
+
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        return values
+
+    def read_header(self, kind: int) -> None:
+        if bytes(self.read_bytes(len(MAGIC))) != MAGIC:
+            raise ValueError("Not an encoded watdo payload")
+
+        version = self.read_byte()
+
+        if version != VERSION:
+            raise ValueError(f"Unsupported format version: {version}")
+
+        if self.read_byte() != kind:
+            raise ValueError("Encoded payload is of another kind")
+
+    def finish(self) -> None:
+        if self.offset != len(self.data):
+            raise ValueError("Encoded data has trailing bytes")
+
+
+def encode_block(block_data: BlockData) -> bytes:
+    """Encode a block into the versioned binary format. Tags are sorted."""
+    buffer = bytearray()
+    _write_header(buffer, _BLOCK)
+    _write_str(buffer, block_data["title"])
+    _write_optional_str(buffer, block_data["notes"])
+    tags = block_data["tags"]
+    _write_optional_strs(buffer, None if tags is None else sorted(tags))
+    _write_optional_strs(buffer, block_data["tasks"])
+    _write_optional_str(buffer, block_data["timezone"])
+    _write_varint(buffer, len(block_data["schedule"]))
+
+    for action, date_string in block_data["schedule"]:
+        buffer.append(action == "set")
+        _write_optional_str(buffer, date_string)
+
+    return bytes(buffer)
+
+
+def decode_block(data: bytes) -> BlockData:
+    reader = _Reader(data)
+    reader.read_header(_BLOCK)
+    title = reader.read_str()
+    notes = reader.read_optional_str()
+    tags = reader.read_optional_strs()
+    tasks = reader.read_optional_strs()
+    timezone = reader.read_optional_str()
+    schedule: list[ScheduleEntry] = []
+
+    for _ in range(reader.read_varint()):
+        action = "set" if reader.read_byte() else "end"
+        schedule.append(cast(ScheduleEntry, (action, reader.read_optional_str())))
+
+    reader.finish()
+
+    return {
+        "title": title,
+        "notes": notes,
+        "tags": None if tags is None else set(tags),
+        "tasks": tasks,
+        "timezone": timezone,
+        "schedule": schedule,
+    }
+
+
+def encode_schedule(compiled_schedule: CompiledSchedule) -> bytes:
+    """
+    Encode a compiled schedule with its resolved timestamps, so decoding it
+    needs no date parsing.
+    """
+    timestamps, offsets, actions, before, final = compiled_schedule.to_arrays()
+    buffer = bytearray()
+    _write_header(buffer, _SCHEDULE)
+    _write_varint(buffer, len(timestamps))
+    _write_array(buffer, timestamps)
+    _write_array(buffer, offsets)
+    buffer += actions
+    buffer += before
+    buffer.append(final)
+    return bytes(buffer)
+
+
+def decode_schedule(data: bytes) -> CompiledSchedule:
+    reader = _Reader(data)
+    reader.read_header(_SCHEDULE)
+    length = reader.read_varint()
+    timestamps = reader.read_array("q", length)
+    offsets = reader.read_array("i", length)
+    actions = bytes(reader.read_bytes(length))
+    before = bytes(reader.read_bytes(length))
+    final = reader.read_byte()
+    reader.finish()
+    return CompiledSchedule.from_arrays(timestamps, offsets, actions, before, final)
@@ -1,35 +1,383 @@
+import re
 import datetime
-import dateutil
-import dateparser
+import functools
+from typing import TYPE_CHECKING, Generator, Literal
+from .cache import LRUCache
+from .zone import Zone, get_zone
 
+# `dateparser` takes hundreds of milliseconds to import, so it is only imported
+# once a segment actually needs it
+if TYPE_CHECKING:
+    from dateparser import DateDataParser
 
-def parse_date_string(
-    date_string_expression: str,
-    relative_base: datetime.datetime | None = None,
-    *,
-    timezone: str | None = None,
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+}  # fmt: skip
+_MONTH = "|".join(sorted(_MONTHS, key=len, reverse=True))
+
+# The subset of date expressions that is resolved without `dateparser`:
+#
+#   date      Aug 1 2025 | August 1st, 2025 | 1 Aug 2025 | 2025-08-01
+#   time      9:00 | 9:00:30 | 9 AM | 9:00 PM | at 9:00 AM
+#   timezone  UTC | GMT | UTC+8 | UTC-3:30 | UTC+0530
+#
+# At least a date or a time is required and the parts must appear in that
+# order. Expressions that spell out a full calendar date resolve to the same
+# instant no matter what the relative base is.
+_DATE_PATTERN = re.compile(
+    rf"""
+    ^\s*
+    (?:
+        (?P<month>{_MONTH})\.?\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<year>\d{{4}})
+        | (?P<day2>\d{{1,2}})\s+(?P<month2>{_MONTH})\.?,?\s+(?P<year2>\d{{4}})
+        | (?P<year3>\d{{4}})-(?P<month3>\d{{1,2}})-(?P<day3>\d{{1,2}})
+    )?
+    (?:
+        (?(month),?\s+|(?(day2),?\s+|(?(year3)\s+|)))
+        (?:at\s+)?
+        (?P<hour>\d{{1,2}})
+        (?:
+            :(?P<minute>\d{{2}})(?::(?P<second>\d{{2}}))?(?:\s*(?P<meridiem>[ap])\.?m\.?)?
+            | \s*(?P<meridiem2>[ap])\.?m\.?
+        )
+    )?
+    (?:
+        \s+(?P<tz>(?:utc|gmt)(?:[+-]\d{{1,2}}(?::?\d{{2}})?)?)
+    )?
+    \s*$
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_OFFSET_PATTERN = re.compile(
+    r"^(?:utc|gmt)(?:(?P<sign>[+-])(?:(?P<hours>\d{1,2})(?::(?P<minutes>\d{2}))?"
+    r"|(?P<hours2>\d{2})(?P<minutes2>\d{2})))?$",
+    re.IGNORECASE,
+)
+
+# UTC offsets (in minutes) that `dateparser` recognizes, anything else is left
+# for `dateparser` to interpret
+_KNOWN_OFFSETS = {
+    -720, -660, -600, -570, -540, -480, -420, -360, -300, -270, -240, -210,
+    -180, -150, -120, -60, 0, 60, 120, 180, 210, 240, 270, 300, 330, 345, 360,
+    390, 420, 480, 525, 540, 570, 600, 630, 660, 690, 720, 765, 780, 840,
+}  # fmt: skip
+
+# Segments that only move the previous date forward, so a chain that is already
+# past some date stays past it whatever they resolve to
+_FORWARD_PATTERN = re.compile(
+    r"^\s*in\s+\d+\s+(?:second|minute|hour|day|week|month|year)s?\s*$",
+    re.IGNORECASE,
+)
+
+_TIME_OF_DAY = r"""
+    (?:
+        \d{1,2}(?::\d{2}(?::\d{2})?(?:\s*[ap]\.?m\.?)?|\s*[ap]\.?m\.?)
+        | noon | midnight
+    )
+"""
+_DAY = r"""
+    (?:
+        today | tomorrow | yesterday
+        | (?:(?:next|last)\s+)?(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)
+    )
+"""
+
+# Expressions that name a time of day, optionally on a day relative to the base,
+# resolve to the same instant for every base on the same date. Anything that
+# keeps the base's time of day (such as "tomorrow" or "in 2 days") does not
+_DATE_OF_BASE_PATTERN = re.compile(
+    rf"""
+    ^\s*
+    (?:{_DAY}\s+(?:at\s+)?)?
+    (?:at\s+)?{_TIME_OF_DAY}
+    (?:\s+{_DAY})?
+    \s*$
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# How much of the relative base a date expression depends on: nothing, only its
+# date in the expression's timezone, or the exact instant
+BaseDependency = Literal["absolute", "date", "exact"]
+
+BaseKey = tuple[datetime.datetime, datetime.timedelta | None, str]
+DateCacheKey = tuple[str, str, BaseKey | datetime.date | None]
+DateParserKey = tuple[str, tuple[str, ...], BaseKey | None]
+
+# Memoized `dateparser` results for single `->` segments, keyed as coarsely as
+# the segment's dependency on the relative base allows: absolute segments are
+# shared across all bases, time-of-day segments across bases on the same date
+# and everything else needs the exact base. Segments without a relative base
+# depend on the current time and are skipped
+date_cache: LRUCache[DateCacheKey, datetime.datetime] = LRUCache(maxsize=4096)
+
+# Configured `dateparser` parsers, since the relative base is part of their
+# settings. Blocks evaluated together share a base, so they share parsers too
+date_parsers: "LRUCache[DateParserKey, DateDataParser]" = LRUCache(maxsize=256)
+
+# Languages `dateparser` may interpret segments in, instead of detecting them
+# among every language it supports
+_languages: tuple[str, ...] = ("en",)
+
+
+def set_date_languages(languages: list[str]) -> None:
+    """Set the languages date segments are parsed in, defaulting to English."""
+    global _languages
+
+    _languages = tuple(languages)
+    date_cache.clear()
+    date_parsers.clear()
+
+
+@functools.cache
+def _fixed_offset(timezone: str) -> datetime.timezone | None:
+    match = _OFFSET_PATTERN.match(timezone)
+
+    if match is None:
+        return None
+
+    sign = -1 if match["sign"] == "-" else 1
+    hours = int(match["hours"] or match["hours2"] or 0)
+    minutes = int(match["minutes"] or match["minutes2"] or 0)
+    offset = sign * (hours * 60 + minutes)
+
+    if offset not in _KNOWN_OFFSETS:
+        return None
+
+    return datetime.timezone(datetime.timedelta(minutes=offset))
+
+
+def _has_date(match: re.Match[str]) -> bool:
+    return any(match[group] is not None for group in ("year", "year2", "year3"))
+
+
+def _segment_dependency(
+    match: re.Match[str] | None, date_string: str
+) -> BaseDependency:
+    # `match` is the segment matched against `_DATE_PATTERN`
+    if match is not None and _has_date(match):
+        return "absolute"
+
+    if _DATE_OF_BASE_PATTERN.match(date_string) is not None:
+        return "date"
+
+    return "exact"
+
+
+def _parse_fast(
+    match: re.Match[str],
+    relative_base: datetime.datetime | None,
+    timezone: str,
 ) -> datetime.datetime | None:
-    timezone = timezone or "UTC"
-    last_date: datetime.datetime
+    """
+    Resolve an expression matched by `_DATE_PATTERN` without `dateparser`.
 
-    if relative_base is not None:
-        tz = dateutil.tz.gettz(timezone)
-        relative_base = relative_base.astimezone(tz)
+    Returns `None` whenever the fast path cannot decide, in which case the
+    caller falls back to `dateparser`.
+    """
+
+    tz = _fixed_offset(timezone)
+
+    if tz is None:
+        return None
+
+    date_tz = tz if match["tz"] is None else _fixed_offset(match["tz"])
+
+    if date_tz is None:
+        return None
+
+    if match["year"] is not None:
+        year, month, day = match["year"], _MONTHS[match["month"].lower()], match["day"]
+    elif match["year2"] is not None:
+        year, month, day = (
+            match["year2"],
+            _MONTHS[match["month2"].lower()],
+            match["day2"],
+        )
+    elif match["year3"] is not None:
+        year, month, day = match["year3"], int(match["month3"]), match["day3"]
+    elif match["hour"] is not None and relative_base is not None:
+        # Time-only expressions are placed on the date of the relative base,
+        # which is only well-defined here when the base is already in `tz`
+        if relative_base.utcoffset() != tz.utcoffset(None) or match["tz"] is not None:
+            return None
+
+        year, month, day = relative_base.year, relative_base.month, relative_base.day
+    else:
+        return None
+
+    hour = int(match["hour"] or 0)
+    meridiem = (match["meridiem"] or match["meridiem2"] or "").lower()
+
+    if meridiem != "":
+        if not 1 <= hour <= 12:
+            return None
+
+        hour = hour % 12 + (12 if meridiem == "p" else 0)
 
-    for date_string in date_string_expression.split("->"):
-        date = dateparser.parse(
-            date_string,
+    try:
+        date = datetime.datetime(
+            int(year),
+            month,
+            int(day),
+            hour,
+            int(match["minute"] or 0),
+            int(match["second"] or 0),
+            tzinfo=date_tz,
+        )
+        return date.astimezone(tz)
+    except (ValueError, OverflowError):
+        return None
+
+
+def _relative_base_key(relative_base: datetime.datetime) -> BaseKey:
+    # Timezone objects returned by dateparser are not hashable by value, so the
+    # base is keyed by its wall time, its offset and the identity of its zone
+    return (
+        relative_base.replace(tzinfo=None),
+        relative_base.utcoffset(),
+        repr(relative_base.tzinfo),
+    )
+
+
+def _date_parser(
+    timezone: str, relative_base: datetime.datetime | None
+) -> "DateDataParser":
+    key = (
+        timezone,
+        _languages,
+        None if relative_base is None else _relative_base_key(relative_base),
+    )
+    parser = date_parsers.get(key)
+
+    if parser is None:
+        import dateparser
+
+        parser = dateparser.DateDataParser(
+            languages=list(_languages),
             settings={
                 "TIMEZONE": timezone,
                 "RETURN_AS_TIMEZONE_AWARE": True,
                 **({} if relative_base is None else {"RELATIVE_BASE": relative_base}),
             },
         )
+        date_parsers.put(key, parser)
+
+    return parser
+
+
+def _parse_segment(
+    date_string: str,
+    relative_base: datetime.datetime | None,
+    timezone: str,
+    *,
+    base_in_timezone: bool = False,
+) -> datetime.datetime | None:
+    """
+    `base_in_timezone` tells that `relative_base` is expressed in `timezone`,
+    so its date is the date the segment is resolved on.
+    """
+    match = _DATE_PATTERN.match(date_string)
+    key: DateCacheKey | None = None
+
+    if match is not None:
+        date = _parse_fast(match, relative_base, timezone)
+
+        if date is not None:
+            return date
+
+    dependency = _segment_dependency(match, date_string)
+
+    if dependency == "absolute":
+        key = (date_string, timezone, None)
+    elif relative_base is None:
+        pass
+    elif base_in_timezone and dependency == "date":
+        key = (date_string, timezone, relative_base.date())
+    else:
+        key = (date_string, timezone, _relative_base_key(relative_base))
+
+    if key is not None:
+        cached_date = date_cache.get(key)
+
+        if cached_date is not None:
+            return cached_date
+
+    date = _date_parser(timezone, relative_base).get_date_data(date_string).date_obj
+
+    if key is not None and date is not None:
+        date_cache.put(key, date)
+
+    return date
+
+
+def split_date_expression(date_string_expression: str) -> list[str]:
+    return date_string_expression.split("->")
+
+
+def is_forward_segment(date_string: str) -> bool:
+    """Whether the segment is an `in N unit(s)` offset from the previous date."""
+    return _FORWARD_PATTERN.match(date_string) is not None
+
+
+def base_dependency(date_string_expression: str) -> BaseDependency:
+    """
+    How much of the relative base a date expression depends on.
+
+    Only the first segment of a `->` chain is resolved against the base, the
+    others against the date before them, so it decides for the whole chain.
+    """
+    date_string = split_date_expression(date_string_expression)[0]
+    return _segment_dependency(_DATE_PATTERN.match(date_string), date_string)
+
+
+def resolve_date_segments(
+    date_strings: list[str],
+    relative_base: datetime.datetime | None = None,
+    *,
+    timezone: str | Zone | None = None,
+) -> Generator[datetime.datetime | None, None, None]:
+    """
+    Yield the date each segment of a `->` chain resolves to, in order.
+
+    Every segment is resolved relative to the previous one. If a segment fails
+    to parse, `None` is yielded and the chain stops.
+    """
+    zone = get_zone(timezone)
+
+    if relative_base is not None:
+        relative_base = relative_base.astimezone(zone.tzinfo)
+
+    for index, date_string in enumerate(date_strings):
+        # Later segments are relative to a parsed date, whose zone may differ
+        date = _parse_segment(
+            date_string, relative_base, zone.name, base_in_timezone=index == 0
+        )
+        yield date
 
         if date is None:
-            return None
+            return
 
-        last_date = date
         relative_base = date
 
+
+def parse_date_string(
+    date_string_expression: str,
+    relative_base: datetime.datetime | None = None,
+    *,
+    timezone: str | Zone | None = None,
+) -> datetime.datetime | None:
+    last_date: datetime.datetime | None = None
+
+    for last_date in resolve_date_segments(
+        split_date_expression(date_string_expression),
+        relative_base,
+        timezone=timezone,
+    ):
+        pass
+
     return last_date
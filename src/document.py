@@ -0,0 +1,135 @@
+import functools
+from typing import Generator, Iterable
+from .block import BlockData, PartialBlockData
+from .fields import Field, split_fields
+from .parser import parse_field, parse_fields
+from .variables import apply_variables
+
+BLOCK_SEPARATOR = "---"
+
+
+class BlockHandle:
+    """
+    A block inside a multi-block document, parsed only when accessed.
+
+    `line_no_range` is 1-based and inclusive, while `byte_range` is the
+    half-open range of the block's UTF-8 encoded source in the document.
+    """
+
+    def __init__(
+        self,
+        document: str,
+        char_range: tuple[int, int],
+        byte_range: tuple[int, int],
+        line_no_range: tuple[int, int],
+        variables: dict[str, str],
+    ) -> None:
+        self.byte_range = byte_range
+        self.line_no_range = line_no_range
+        self._document = document
+        self._char_range = char_range
+        self._variables = variables
+
+    @property
+    def code(self) -> str:
+        start, end = self._char_range
+        return self._document[start:end]
+
+    @functools.cached_property
+    def fields(self) -> list[Field]:
+        """Fields of the block, with line numbers relative to the block."""
+        return list(split_fields(apply_variables(self.code, self._variables)))
+
+    @functools.cached_property
+    def block(self) -> BlockData:
+        return parse_fields(self.fields)
+
+    def get(self, key: str) -> PartialBlockData:
+        """Parse only the fields named `key`, leaving every other value as is."""
+        partial_block_data: PartialBlockData = {}
+
+        # Unless every field was already split, other values are not built
+        if "fields" in self.__dict__:
+            fields: Iterable[Field] = self.fields
+        else:
+            code = apply_variables(self.code, self._variables)
+            fields = split_fields(code, keys={key})
+
+        for field in fields:
+            if field["key"].strip().lower() == key:
+                partial_block_data.update(parse_field(field))
+
+        return partial_block_data
+
+    @property
+    def title(self) -> str | None:
+        return self.get("title").get("title")
+
+
+def parse_document(
+    document: str, variables: dict[str, str]
+) -> Generator[BlockHandle, None, None]:
+    """
+    Scan a document of blocks separated by `---` lines, yielding a lazy handle
+    per block.
+
+    Separators inside multiline values are part of the value. Blocks that are
+    entirely blank are skipped.
+    """
+
+    char_offset = 0
+    byte_offset = 0
+    block_start: tuple[int, int, int] | None = None
+    block_end = (0, 0, 0)
+    multiline_mode = False
+
+    for index, line in enumerate(document.splitlines(keepends=True)):
+        line_no = index + 1
+        line_start = (char_offset, byte_offset, line_no)
+        char_offset += len(line)
+        byte_offset += len(line.encode())
+
+        # Mirror the multiline detection of `split_fields` without building the
+        # fields themselves
+        if multiline_mode:
+            if line.rstrip().endswith('"""'):
+                multiline_mode = False
+
+        elif line.strip() == "":
+            continue
+
+        elif line.strip() == BLOCK_SEPARATOR:
+            if block_start is not None:
+                yield _handle(document, block_start, block_end, variables)
+
+            block_start = None
+            continue
+
+        elif ":" in line:
+            value = line.split(":", 1)[1].lstrip()
+
+            if value.startswith('"""'):
+                multiline_mode = not value[3:].rstrip().endswith('"""')
+
+        if block_start is None:
+            block_start = line_start
+
+        block_end = (char_offset, byte_offset, line_no)
+
+    if block_start is not None:
+        yield _handle(document, block_start, block_end, variables)
+
+
+def _handle(
+    document: str,
+    block_start: tuple[int, int, int],
+    block_end: tuple[int, int, int],
+    variables: dict[str, str],
+) -> BlockHandle:
+    return BlockHandle(
+        document,
+        (block_start[0], block_end[0]),
+        (block_start[1], block_end[1]),
+        (block_start[2], block_end[2]),
+        variables,
+    )
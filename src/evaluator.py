@@ -1,21 +1,33 @@
+import array
+import heapq
+import bisect
 import datetime
-from typing import Generator
-from .date import parse_date_string
-from .block import Action, ScheduleEntry
+import functools
+from typing import Generator, TypedDict
+from .date import (
+    parse_date_string,
+    split_date_expression,
+    is_forward_segment,
+    resolve_date_segments,
+)
+from .block import Action, BlockData, ScheduleEntry
+from .zone import Zone, get_zone
 
 
 def generate_timeline(
     schedule: list[ScheduleEntry],
     relative_base: datetime.datetime,
     *,
-    timezone: str | None = None,
+    timezone: str | Zone | None = None,
 ) -> Generator[tuple[Action, datetime.datetime | None], None, None]:
+    zone = get_zone(timezone)
+
     for action, date_string in schedule:
         if date_string is None:
             yield action, None
 
         else:
-            date = parse_date_string(date_string, relative_base, timezone=timezone)
+            date = parse_date_string(date_string, relative_base, timezone=zone)
 
             if date is None:
                 raise ValueError(f"Failed parsing '{date_string}'")
@@ -23,14 +35,77 @@ def generate_timeline(
             yield action, date
 
 
+def _generate_lazy_timeline(
+    schedule: list[ScheduleEntry],
+    relative_base: datetime.datetime,
+    evaluation_date: datetime.datetime,
+    *,
+    timezone: str | Zone | None = None,
+) -> Generator[tuple[Action, datetime.datetime | None], None, None]:
+    # A chain whose partial result is already past the evaluation date, and
+    # whose remaining segments only move forward, is yielded unfinished since
+    # `evaluate_schedule` stops there without looking at the date itself
+    zone = get_zone(timezone)
+
+    for action, date_string in schedule:
+        if date_string is None:
+            yield action, None
+            continue
+
+        date_strings = split_date_expression(date_string)
+        dates = resolve_date_segments(date_strings, relative_base, timezone=zone)
+
+        for index, date in enumerate(dates, 1):
+            if date is None:
+                raise ValueError(f"Failed parsing '{date_string}'")
+
+            if date > evaluation_date and all(
+                is_forward_segment(remaining) for remaining in date_strings[index:]
+            ):
+                break
+
+        assert date is not None
+        yield action, date
+
+
+def validate_schedule(
+    schedule: list[ScheduleEntry],
+    relative_base: datetime.datetime,
+    *,
+    timezone: str | Zone | None = None,
+) -> None:
+    """
+    Resolve every entry of the schedule in full, raising `ValueError` on the
+    first one that fails to parse.
+
+    `evaluate_schedule` only parses what the evaluation needs, so an invalid
+    entry past the evaluation date goes unnoticed there.
+    """
+    for _ in generate_timeline(schedule, relative_base, timezone=timezone):
+        pass
+
+
 def evaluate_schedule(
     schedule: list[ScheduleEntry],
     *,
     relative_base: datetime.datetime,
     evaluation_date: datetime.datetime,
-    timezone: str | None = None,
+    timezone: str | Zone | None = None,
+    lazy: bool = False,
 ) -> tuple[bool, datetime.datetime | None]:
-    timeline = generate_timeline(schedule, relative_base, timezone=timezone)
+    """
+    With `lazy`, `->` chains are resolved only until they are known to land
+    past the evaluation date, so their remaining segments are neither parsed
+    nor validated. The result is the same for schedules that pass
+    `validate_schedule`.
+    """
+    if lazy:
+        timeline = _generate_lazy_timeline(
+            schedule, relative_base, evaluation_date, timezone=timezone
+        )
+    else:
+        timeline = generate_timeline(schedule, relative_base, timezone=timezone)
+
     evaluation = False
     matched_date: datetime.datetime | None = None
 
@@ -50,3 +125,383 @@ def evaluate_schedule(
                 break
 
     return evaluation, matched_date
+
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_SECOND = datetime.timedelta(seconds=1)
+
+# Packed evaluation state: the evaluation, and whether the matched date is the
+# preceding dated entry (otherwise it is `None`)
+_SET = 1
+_MATCHED = 2
+
+Evaluation = tuple[bool, datetime.datetime | None]
+
+
+# A `[start, end)` epoch-microsecond range with its evaluation and start date
+_Piece = tuple[int | None, int | None, bool, datetime.datetime | None]
+
+
+class Transition(TypedDict):
+    date: datetime.datetime
+    evaluation: bool
+
+
+def to_timestamp(date: datetime.datetime) -> int:
+    """Microseconds since the Unix epoch, exact for tz-aware datetimes."""
+    return (date - _EPOCH) // _MICROSECOND
+
+
+@functools.cache
+def _fixed_timezone(offset: int) -> datetime.timezone:
+    return datetime.timezone(datetime.timedelta(seconds=offset))
+
+
+def from_timestamp(timestamp: int, offset: int = 0) -> datetime.datetime:
+    """Inverse of `to_timestamp`, in a fixed UTC offset given in seconds."""
+    return (_EPOCH + datetime.timedelta(microseconds=timestamp)).astimezone(
+        _fixed_timezone(offset)
+    )
+
+
+def _running_maxima(timestamps: "array.array[int]") -> "array.array[int]":
+    bounds = array.array("q")
+
+    for timestamp in timestamps:
+        bounds.append(max(timestamp, bounds[-1]) if bounds else timestamp)
+
+    return bounds
+
+
+class CompiledSchedule:
+    """
+    A schedule resolved once against a relative base and timezone.
+
+    `evaluate_schedule` walks the timeline in order and stops at the first
+    dated entry that is not before the evaluation date. Since that entry is the
+    first one whose running maximum reaches the evaluation date, the running
+    maxima form a sorted array that can be bisected.
+
+    Only dated entries are stored, as epoch microseconds with their UTC offset
+    in seconds, and evaluations are packed into bytes, so a compiled schedule
+    holds no datetimes and matched dates are rebuilt when returned.
+    """
+
+    __slots__ = ("_timestamps", "_bounds", "_offsets", "_actions", "_before", "_final")
+
+    def __init__(
+        self,
+        schedule: list[ScheduleEntry],
+        relative_base: datetime.datetime,
+        *,
+        timezone: str | Zone | None = None,
+    ) -> None:
+        self._timestamps = array.array("q")
+        self._bounds = array.array("q")
+        self._offsets = array.array("i")
+        self._actions = bytearray()
+        self._before = bytearray()
+
+        state = 0
+
+        for action, date in generate_timeline(
+            schedule, relative_base, timezone=timezone
+        ):
+            if date is None:
+                state = _SET if action == "set" else 0
+                continue
+
+            timestamp = to_timestamp(date)
+            offset = date.utcoffset()
+            assert offset is not None
+
+            self._timestamps.append(timestamp)
+            self._offsets.append(offset // _SECOND)
+            self._actions.append(action == "set")
+            self._before.append(state)
+            state = _SET | _MATCHED if action == "set" else _MATCHED
+
+        self._final = state
+        self._bounds = _running_maxima(self._timestamps)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: "array.array[int]",
+        offsets: "array.array[int]",
+        actions: bytes,
+        before: bytes,
+        final: int,
+    ) -> "CompiledSchedule":
+        """
+        Rebuild a compiled schedule from the entries `to_arrays` returns,
+        without resolving the schedule again.
+        """
+        if not len(timestamps) == len(offsets) == len(actions) == len(before):
+            raise ValueError("Compiled schedule arrays differ in length")
+
+        compiled_schedule = cls.__new__(cls)
+        compiled_schedule._timestamps = array.array("q", timestamps)
+        compiled_schedule._offsets = array.array("i", offsets)
+        compiled_schedule._actions = bytearray(actions)
+        compiled_schedule._before = bytearray(before)
+        compiled_schedule._final = final
+        compiled_schedule._bounds = _running_maxima(compiled_schedule._timestamps)
+        return compiled_schedule
+
+    def to_arrays(
+        self,
+    ) -> tuple["array.array[int]", "array.array[int]", bytes, bytes, int]:
+        """
+        The dated entries as epoch microseconds, UTC offsets in seconds,
+        whether each one sets, and the packed evaluation before each one,
+        followed by the final packed evaluation.
+        """
+        return (
+            array.array("q", self._timestamps),
+            array.array("i", self._offsets),
+            bytes(self._actions),
+            bytes(self._before),
+            self._final,
+        )
+
+    @classmethod
+    def from_block(
+        cls, block_data: BlockData, relative_base: datetime.datetime
+    ) -> "CompiledSchedule":
+        return cls(
+            block_data["schedule"],
+            relative_base,
+            timezone=block_data["timezone"],
+        )
+
+    def evaluate(self, evaluation_date: datetime.datetime) -> Evaluation:
+        """Same result as `evaluate_schedule` for the compiled schedule."""
+        if not self._bounds:
+            return self._unpack(self._final, -1)
+
+        timestamp = to_timestamp(evaluation_date)
+        index = bisect.bisect_left(self._bounds, timestamp)
+
+        if index == len(self._bounds):
+            return self._unpack(self._final, index - 1)
+
+        if self._timestamps[index] == timestamp:
+            return bool(self._actions[index]), self._date(index)
+
+        return self._unpack(self._before[index], index - 1)
+
+    def _evaluation(self, timestamp: int) -> bool:
+        # Same as `evaluate(...)[0]`, without building the matched date
+        index = bisect.bisect_left(self._bounds, timestamp)
+
+        if index == len(self._bounds):
+            return bool(self._final & _SET)
+
+        if self._timestamps[index] == timestamp:
+            return bool(self._actions[index])
+
+        return bool(self._before[index] & _SET)
+
+    def _date(self, index: int) -> datetime.datetime:
+        return from_timestamp(self._timestamps[index], self._offsets[index])
+
+    def _unpack(self, state: int, index: int) -> Evaluation:
+        # `index` is the dated entry a matched date would refer to
+        return bool(state & _SET), self._date(index) if state & _MATCHED else None
+
+    def _pieces(self) -> list[_Piece]:
+        """
+        Consecutive `[start, end)` epoch-microsecond ranges of constant
+        evaluation, each with the datetime it starts at (`None` if unbounded).
+        """
+        # Between two distinct bounds the evaluation is the one before the
+        # later bound, and exactly at a bound it is the one at that bound
+        pieces: list[_Piece] = []
+        previous_bound: int | None = None
+        previous_date: datetime.datetime | None = None
+
+        for index, bound in enumerate(self._bounds):
+            if previous_bound is not None and bound == previous_bound:
+                continue
+
+            # A strictly greater running maximum is the entry's own date
+            evaluation = bool(self._actions[index])
+            date = self._date(index)
+
+            if previous_bound is None or previous_bound + 1 < bound:
+                pieces.append(
+                    (
+                        None if previous_bound is None else previous_bound + 1,
+                        bound,
+                        bool(self._before[index] & _SET),
+                        None if previous_date is None else previous_date + _MICROSECOND,
+                    )
+                )
+
+            pieces.append((bound, bound + 1, evaluation, date))
+            previous_bound = bound
+            previous_date = date
+
+        pieces.append(
+            (
+                None if previous_bound is None else previous_bound + 1,
+                None,
+                bool(self._final & _SET),
+                None if previous_date is None else previous_date + _MICROSECOND,
+            )
+        )
+
+        return pieces
+
+    def intervals(self) -> list[tuple[int | None, int | None]]:
+        """
+        Half-open `[start, end)` epoch-microsecond intervals where the schedule
+        evaluates to `True`, with `None` for an unbounded side.
+        """
+        intervals: list[tuple[int | None, int | None]] = []
+
+        for start, end, evaluation, _ in self._pieces():
+            if not evaluation:
+                continue
+
+            if intervals and intervals[-1][1] == start:
+                intervals[-1] = (intervals[-1][0], end)
+            else:
+                intervals.append((start, end))
+
+        return intervals
+
+    def transitions(
+        self, after: datetime.datetime
+    ) -> Generator[Transition, None, None]:
+        """
+        Every change of evaluation strictly after `after`, in order.
+
+        A transition right after a dated entry takes effect one microsecond
+        after that entry, which is the first instant the new evaluation holds.
+        Entries are walked lazily from the first bound after `after`, and a
+        datetime is only built for each transition yielded.
+        """
+        timestamp = to_timestamp(after)
+        evaluation = self._evaluation(timestamp)
+        bounds = self._bounds
+        index = bisect.bisect_right(bounds, timestamp)
+
+        # The entry that set the latest bound up to `after`, since the
+        # evaluation right after it may still change after `after`
+        previous = bisect.bisect_left(bounds, bounds[index - 1]) if index else None
+
+        # Walks the same pieces as `_pieces`, one entry per distinct bound
+        while index < len(bounds):
+            bound = bounds[index]
+
+            if previous is not None and timestamp < bounds[previous] + 1 < bound:
+                if bool(self._before[index] & _SET) != evaluation:
+                    evaluation = not evaluation
+                    yield {
+                        "date": self._date(previous) + _MICROSECOND,
+                        "evaluation": evaluation,
+                    }
+
+            if bool(self._actions[index]) != evaluation:
+                evaluation = not evaluation
+                yield {"date": self._date(index), "evaluation": evaluation}
+
+            previous = index
+            index = bisect.bisect_right(bounds, bound, index)
+
+        if previous is not None and timestamp < bounds[previous] + 1:
+            if bool(self._final & _SET) != evaluation:
+                yield {
+                    "date": self._date(previous) + _MICROSECOND,
+                    "evaluation": not evaluation,
+                }
+
+    def next_transition(self, after: datetime.datetime) -> Transition | None:
+        return next(self.transitions(after), None)
+
+    def evaluate_many(
+        self, evaluation_dates: list[datetime.datetime]
+    ) -> tuple[list[bool], list[datetime.datetime | None]]:
+        """
+        Evaluate many dates in one sorted merge against the compiled bounds.
+
+        Returns parallel lists of evaluations and matched dates, in the order
+        of `evaluation_dates`.
+        """
+        final_evaluation, final_matched_date = self._unpack(
+            self._final, len(self._bounds) - 1
+        )
+        evaluations = [final_evaluation] * len(evaluation_dates)
+        matched_dates = [final_matched_date] * len(evaluation_dates)
+
+        if not self._bounds:
+            return evaluations, matched_dates
+
+        timestamps = [to_timestamp(date) for date in evaluation_dates]
+        index = 0
+
+        for position in sorted(range(len(timestamps)), key=timestamps.__getitem__):
+            timestamp = timestamps[position]
+
+            while index < len(self._bounds) and self._bounds[index] < timestamp:
+                index += 1
+
+            if index == len(self._bounds):
+                break
+
+            if self._timestamps[index] == timestamp:
+                evaluations[position] = bool(self._actions[index])
+                matched_dates[position] = self._date(index)
+            else:
+                evaluations[position], matched_dates[position] = self._unpack(
+                    self._before[index], index - 1
+                )
+
+        return evaluations, matched_dates
+
+
+def evaluate_schedule_many(
+    schedule: list[ScheduleEntry],
+    evaluation_dates: list[datetime.datetime],
+    *,
+    relative_base: datetime.datetime,
+    timezone: str | Zone | None = None,
+) -> tuple[list[bool], list[datetime.datetime | None]]:
+    compiled_schedule = CompiledSchedule(schedule, relative_base, timezone=timezone)
+    return compiled_schedule.evaluate_many(evaluation_dates)
+
+
+def next_transition(
+    schedule: list[ScheduleEntry],
+    *,
+    after: datetime.datetime,
+    relative_base: datetime.datetime,
+    timezone: str | Zone | None = None,
+) -> Transition | None:
+    compiled_schedule = CompiledSchedule(schedule, relative_base, timezone=timezone)
+    return compiled_schedule.next_transition(after)
+
+
+def upcoming_transitions(
+    blocks: dict[str, BlockData],
+    *,
+    after: datetime.datetime,
+    relative_base: datetime.datetime,
+) -> list[tuple[datetime.datetime, str, bool]]:
+    """
+    Min-heap of `(date, block_id, evaluation)` for every transition of every
+    block after `after`, ready for `heapq.heappop`.
+    """
+    heap: list[tuple[datetime.datetime, str, bool]] = []
+
+    for block_id, block_data in blocks.items():
+        compiled_schedule = CompiledSchedule.from_block(block_data, relative_base)
+
+        for transition in compiled_schedule.transitions(after):
+            heap.append((transition["date"], block_id, transition["evaluation"]))
+
+    heapq.heapify(heap)
+    return heap
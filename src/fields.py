@@ -1,4 +1,4 @@
-from typing import TypedDict, Generator
+from typing import Container, Iterable, Iterator, TypedDict, Generator
 
 
 class Field(TypedDict):
@@ -8,12 +8,43 @@ class Field(TypedDict):
     value: str
 
 
-def split_fields(code: str) -> Generator[Field, None, None]:
+def _iter_lines(code: Iterable[str]) -> Iterator[str]:
+    # Items may carry their own line terminator (as text streams do) or be
+    # bare lines, so each one is split the same way `str.splitlines` would
+    for chunk in code:
+        if chunk == "":
+            yield chunk
+        else:
+            yield from chunk.splitlines()
+
+
+def _skipped_field(key: str, start_line_no: int, end_line_no: int) -> Field:
+    # Stands in for a field outside `keys`, whose content and value are not built
+    return {
+        "line_no_range": (start_line_no, end_line_no),
+        "content": "",
+        "key": key,
+        "value": "",
+    }
+
+
+def split_fields(
+    code: str | Iterable[str],
+    *,
+    first_line_no: int = 1,
+    keys: Container[str] | None = None,
+) -> Generator[Field, None, None]:
     current_key = ""
-    current_value = ""
+    value_parts: list[str] = []
+    field_lines: list[str] = []
     multiline_mode = False
+    skipped = False
+
+    # `first_line_no` lets a slice of a larger source keep its line numbers
+    lines = code.splitlines() if isinstance(code, str) else _iter_lines(code)
+    numbered_lines = enumerate(lines, first_line_no - 1)
 
-    for index, line in enumerate(code.splitlines()):
+    for index, line in numbered_lines:
         line_no = index + 1
 
         if not multiline_mode:
@@ -30,32 +61,67 @@ def split_fields(code: str) -> Generator[Field, None, None]:
             if current_value == "":
                 raise ValueError(f"Value cannot be empty in line {line_no}")
 
+            field_lines = [line]
+            value_parts = [current_value]
+            skipped = keys is not None and current_key.strip().lower() not in keys
+
             if current_value.lstrip().startswith('"""'):
                 opening_quotes_trimmed = current_value.lstrip()[3:]
 
                 # Make sure the multiline field is actually multiline
                 # If it closes in the same line, then we treat it as a single line
                 if not opening_quotes_trimmed.rstrip().endswith('"""'):
-                    current_value = opening_quotes_trimmed
+                    value_parts = [opening_quotes_trimmed]
                     multiline_mode = True
 
+                    if skipped:
+                        opening_index = index
+
+                        # Values that are never built are only scanned for
+                        # their closing quotes
+                        for index, line in numbered_lines:
+                            if line.rstrip().endswith('"""'):
+                                multiline_mode = False
+                                break
+
+                        if not multiline_mode:
+                            value_line_count = (
+                                index - opening_index + (line.rstrip() != '"""')
+                            )
+                            yield _skipped_field(
+                                current_key, index - value_line_count + 2, index + 1
+                            )
+
+                        continue
+
         else:
-            current_value += f"\n{line}"
+            field_lines.append(line)
 
             if line.rstrip().endswith('"""'):
-                current_value = current_value.rstrip()[:-3]
+                value_parts.append(line.rstrip()[:-3])
                 multiline_mode = False
+            else:
+                value_parts.append(line)
 
         if not multiline_mode:
-            start_line_no = index - len(current_value.splitlines()) + 2
+            # The value's line count as `str.splitlines` reports it: one line per
+            # line break, plus the last part unless it is empty
+            value_line_count = len(value_parts) - 1 + (value_parts[-1] != "")
+            start_line_no = index - value_line_count + 2
             end_line_no = line_no
-            content = "\n".join(code.splitlines()[start_line_no - 1 : end_line_no])
-            field: Field = {
-                "line_no_range": (start_line_no, end_line_no),
-                "content": content,
-                "key": current_key,
-                "value": current_value,
-            }
+            field_first_line_no = line_no - len(field_lines) + 1
+
+            if skipped:
+                field = _skipped_field(current_key, start_line_no, end_line_no)
+            else:
+                field = {
+                    "line_no_range": (start_line_no, end_line_no),
+                    "content": "\n".join(
+                        field_lines[start_line_no - field_first_line_no :]
+                    ),
+                    "key": current_key,
+                    "value": "\n".join(value_parts),
+                }
 
             yield field
 
@@ -0,0 +1,146 @@
+import itertools
+from typing import TypedDict
+from .block import BlockData, PartialBlockData
+from .fields import Field, split_fields
+from .parser import build_block_data, parse_field
+from .variables import apply_variables
+
+
+class TextEdit(TypedDict):
+    start: int
+    end: int
+    text: str
+
+
+class ParseState(TypedDict):
+    code: str
+    lines: list[str]
+    fields: list[Field]
+    partials: list[PartialBlockData]
+    block: BlockData
+
+
+def _build_state(
+    code: str,
+    lines: list[str],
+    fields: list[Field],
+    partials: list[PartialBlockData],
+) -> ParseState:
+    partial_block_data: PartialBlockData = {}
+
+    for partial in partials:
+        partial_block_data.update(partial)
+
+    return {
+        "code": code,
+        "lines": lines,
+        "fields": fields,
+        "partials": partials,
+        "block": build_block_data(partial_block_data),
+    }
+
+
+def parse_code_state(code: str, variables: dict[str, str]) -> ParseState:
+    """Same as `parse_code`, keeping what `reparse_code` needs to reuse."""
+    lines = apply_variables(code, variables).splitlines()
+    fields: list[Field] = []
+    partials: list[PartialBlockData] = []
+
+    for field in split_fields(lines):
+        partials.append(parse_field(field))
+        fields.append(field)
+
+    return _build_state(code, lines, fields, partials)
+
+
+def reparse_code(
+    previous: ParseState, edit: TextEdit, variables: dict[str, str]
+) -> ParseState:
+    """
+    Apply `edit` (a replacement of the `[start, end)` character range of the
+    previous source) and re-parse only the fields it affects.
+
+    Fields that end before the first changed line are reused as is, and once
+    the re-scan reaches a field boundary inside the unchanged tail, the
+    remaining fields are reused with shifted line numbers. Results and errors
+    are the same as a full `parse_code`.
+    """
+
+    previous_code = previous["code"]
+    code = previous_code[: edit["start"]] + edit["text"] + previous_code[edit["end"] :]
+    lines = apply_variables(code, variables).splitlines()
+    previous_lines = previous["lines"]
+
+    common_length = min(len(lines), len(previous_lines))
+    prefix_length = 0
+
+    while (
+        prefix_length < common_length
+        and lines[prefix_length] == previous_lines[prefix_length]
+    ):
+        prefix_length += 1
+
+    suffix_length = 0
+
+    while (
+        suffix_length < common_length - prefix_length
+        and lines[-1 - suffix_length] == previous_lines[-1 - suffix_length]
+    ):
+        suffix_length += 1
+
+    fields: list[Field] = []
+    partials: list[PartialBlockData] = []
+
+    for field, partial in zip(previous["fields"], previous["partials"]):
+        if field["line_no_range"][1] > prefix_length:
+            break
+
+        fields.append(field)
+        partials.append(partial)
+
+    # Old fields by the line they end on, so a boundary in the unchanged tail
+    # can be matched to the old field that follows it
+    line_delta = len(lines) - len(previous_lines)
+    tail_start = len(lines) - suffix_length
+    previous_ends = {
+        field["line_no_range"][1]: index
+        for index, field in enumerate(previous["fields"])
+    }
+    previous_ends[0] = -1
+
+    boundary = fields[-1]["line_no_range"][1] if fields else 0
+    scanner = split_fields(
+        itertools.islice(lines, boundary, None), first_line_no=boundary + 1
+    )
+
+    while True:
+        if boundary >= tail_start and boundary - line_delta in previous_ends:
+            reused_index = previous_ends[boundary - line_delta] + 1
+
+            for field, partial in zip(
+                previous["fields"][reused_index:], previous["partials"][reused_index:]
+            ):
+                start_line_no, end_line_no = field["line_no_range"]
+                fields.append(
+                    {
+                        **field,
+                        "line_no_range": (
+                            start_line_no + line_delta,
+                            end_line_no + line_delta,
+                        ),
+                    }
+                )
+                partials.append(partial)
+
+            break
+
+        scanned_field = next(scanner, None)
+
+        if scanned_field is None:
+            break
+
+        partials.append(parse_field(scanned_field))
+        fields.append(scanned_field)
+        boundary = scanned_field["line_no_range"][1]
+
+    return _build_state(code, lines, fields, partials)
@@ -0,0 +1,154 @@
+import random
+import datetime
+from .evaluator import CompiledSchedule, to_timestamp
+
+# Unbounded interval sides are stored as sentinels so every node compares as
+# plain integers
+_MIN_TIMESTAMP = -(2**63)
+_MAX_TIMESTAMP = 2**63 - 1
+
+_IntervalKey = tuple[int, int, str]
+
+
+class _Node:
+    __slots__ = ("key", "priority", "max_end", "left", "right")
+
+    def __init__(self, key: _IntervalKey) -> None:
+        self.key = key
+        self.priority = random.random()
+        self.max_end = key[1]
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+    def update(self) -> None:
+        self.max_end = self.key[1]
+
+        if self.left is not None and self.left.max_end > self.max_end:
+            self.max_end = self.left.max_end
+
+        if self.right is not None and self.right.max_end > self.max_end:
+            self.max_end = self.right.max_end
+
+
+def _rotate_right(node: _Node) -> _Node:
+    left = node.left
+    assert left is not None
+    node.left = left.right
+    left.right = node
+    node.update()
+    left.update()
+    return left
+
+
+def _rotate_left(node: _Node) -> _Node:
+    right = node.right
+    assert right is not None
+    node.right = right.left
+    right.left = node
+    node.update()
+    right.update()
+    return right
+
+
+def _insert(node: _Node | None, key: _IntervalKey) -> _Node:
+    if node is None:
+        return _Node(key)
+
+    if key < node.key:
+        node.left = _insert(node.left, key)
+
+        if node.left.priority > node.priority:
+            return _rotate_right(node)
+
+    else:
+        node.right = _insert(node.right, key)
+
+        if node.right.priority > node.priority:
+            return _rotate_left(node)
+
+    node.update()
+    return node
+
+
+def _remove(node: _Node | None, key: _IntervalKey) -> _Node | None:
+    if node is None:
+        return None
+
+    if key < node.key:
+        node.left = _remove(node.left, key)
+    elif key > node.key:
+        node.right = _remove(node.right, key)
+    elif node.left is None:
+        return node.right
+    elif node.right is None:
+        return node.left
+    elif node.left.priority > node.right.priority:
+        node = _rotate_right(node)
+        node.right = _remove(node.right, key)
+    else:
+        node = _rotate_left(node)
+        node.left = _remove(node.left, key)
+
+    node.update()
+    return node
+
+
+def _stab(node: _Node | None, timestamp: int, block_ids: set[str]) -> None:
+    while node is not None and node.max_end > timestamp:
+        _stab(node.left, timestamp, block_ids)
+        start, end, block_id = node.key
+
+        # Everything to the right starts after this node
+        if start > timestamp:
+            return
+
+        if timestamp < end:
+            block_ids.add(block_id)
+
+        node = node.right
+
+
+class ScheduleIndex:
+    """
+    Interval tree over the active intervals of many compiled schedules.
+
+    Every interval where a block evaluates to `True` is stored in a treap
+    ordered by start and augmented with the largest end in each subtree, so a
+    stabbing query only descends into subtrees that can still contain it.
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node | None = None
+        self._keys: dict[str, list[_IntervalKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, block_id: str) -> bool:
+        return block_id in self._keys
+
+    def insert(self, block_id: str, compiled_schedule: CompiledSchedule) -> None:
+        """Add a block, replacing its previous intervals if it was indexed."""
+        self.remove(block_id)
+        keys: list[_IntervalKey] = []
+
+        for start, end in compiled_schedule.intervals():
+            key = (
+                _MIN_TIMESTAMP if start is None else start,
+                _MAX_TIMESTAMP if end is None else end,
+                block_id,
+            )
+            self._root = _insert(self._root, key)
+            keys.append(key)
+
+        self._keys[block_id] = keys
+
+    def remove(self, block_id: str) -> None:
+        for key in self._keys.pop(block_id, []):
+            self._root = _remove(self._root, key)
+
+    def active_at(self, date: datetime.datetime) -> set[str]:
+        """IDs of the blocks whose schedule evaluates to `True` at `date`."""
+        block_ids: set[str] = set()
+        _stab(self._root, to_timestamp(date), block_ids)
+        return block_ids
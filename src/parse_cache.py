@@ -0,0 +1,131 @@
+import os
+import json
+import sqlite3
+import hashlib
+from typing import Any, cast
+from .block import BlockData, ScheduleEntry
+from .cache import LRUCache
+from .parser import parse_code
+
+# Part of every cache key, so entries stored by a version whose `parse_code`
+# output or stored layout differs are never read. Bump it with such changes
+CACHE_VERSION = 1
+
+
+def source_key(code: str, variables: dict[str, str]) -> str:
+    """
+    Content hash of a block source and its canonicalized variables, under the
+    current `CACHE_VERSION`.
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}\0".encode())
+    digest.update(code.encode())
+    digest.update(b"\0")
+    digest.update(json.dumps(variables, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _copy_block_data(block_data: BlockData) -> BlockData:
+    # Callers get their own containers so they cannot mutate cached entries
+    return {
+        "title": block_data["title"],
+        "notes": block_data["notes"],
+        "tags": None if block_data["tags"] is None else set(block_data["tags"]),
+        "tasks": None if block_data["tasks"] is None else list(block_data["tasks"]),
+        "timezone": block_data["timezone"],
+        "schedule": list(block_data["schedule"]),
+    }
+
+
+def _dump_block_data(block_data: BlockData) -> str:
+    return json.dumps(
+        {
+            **block_data,
+            "tags": None if block_data["tags"] is None else sorted(block_data["tags"]),
+        }
+    )
+
+
+def _load_block_data(data: str) -> BlockData:
+    raw: dict[str, Any] = json.loads(data)
+    return {
+        "title": raw["title"],
+        "notes": raw["notes"],
+        "tags": None if raw["tags"] is None else set(raw["tags"]),
+        "tasks": raw["tasks"],
+        "timezone": raw["timezone"],
+        "schedule": [cast(ScheduleEntry, tuple(entry)) for entry in raw["schedule"]],
+    }
+
+
+class ParsedBlockCache:
+    """
+    Content-addressed cache in front of `parse_code`.
+
+    Parsed blocks are kept in a bounded LRU and, when `path` is given, in a
+    SQLite file so restarted workers can skip parsing entirely. Failed parses
+    are never cached.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        *,
+        path: str | os.PathLike[str] | None = None,
+    ) -> None:
+        self.memory: LRUCache[str, BlockData] = LRUCache(maxsize=maxsize)
+        self.disk_hits = 0
+        self._connection: sqlite3.Connection | None = None
+
+        if path is not None:
+            self._connection = sqlite3.connect(path, autocommit=True)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS blocks (key TEXT PRIMARY KEY, data TEXT)"
+            )
+
+    def parse_code(self, code: str, variables: dict[str, str]) -> BlockData:
+        key = source_key(code, variables)
+        block_data = self.memory.get(key)
+
+        if block_data is None:
+            block_data = self._load(key)
+
+            if block_data is None:
+                block_data = parse_code(code, variables)
+                self._store(key, block_data)
+            else:
+                self.disk_hits += 1
+
+            self.memory.put(key, block_data)
+
+        return _copy_block_data(block_data)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk_hits = 0
+
+        if self._connection is not None:
+            self._connection.execute("DELETE FROM blocks")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _load(self, key: str) -> BlockData | None:
+        if self._connection is None:
+            return None
+
+        row = self._connection.execute(
+            "SELECT data FROM blocks WHERE key = ?", (key,)
+        ).fetchone()
+
+        return None if row is None else _load_block_data(row[0])
+
+    def _store(self, key: str, block_data: BlockData) -> None:
+        if self._connection is None:
+            return
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO blocks (key, data) VALUES (?, ?)",
+            (key, _dump_block_data(block_data)),
+        )
@@ -1,7 +1,7 @@
-from typing import cast
-from .block import BlockData, PartialBlockData, ScheduleEntry
+from typing import Collection, Iterable, Mapping, cast, overload
+from .block import Block, BlockData, PartialBlockData, ScheduleEntry
 from .fields import Field, split_fields
-from .variables import apply_variables
+from .variables import apply_variables, render_field_value
 
 
 def parse_field(field: Field) -> PartialBlockData:
@@ -66,14 +66,105 @@ def parse_field(field: Field) -> PartialBlockData:
     raise ValueError(f"Invalid key: '{field["key"]}'")
 
 
-def parse_code(code: str, variables: dict[str, str]) -> BlockData:
-    code = apply_variables(code, variables)
-    fields = split_fields(code)
+# Below this many characters, copying the source while filling in variables
+# costs less than rendering its fields one by one
+FIELD_VARIABLES_MIN_SIZE = 2048
+
+
+def _apply_field_variables(
+    code: str, variables: Mapping[str, str]
+) -> list[Field] | None:
+    # Fills in the values holding placeholders, leaving every other field as
+    # split. Only values are rendered, since that is all `parse_field` reads.
+    # `None` means the result could differ from rendering the whole source
+    try:
+        fields = list(split_fields(code))
+    except ValueError:
+        return None
+
+    for index, field in enumerate(fields):
+        if "{" in field["key"] or "}" in field["key"]:
+            return None
+
+        if "{" not in field["value"] and "}" not in field["value"]:
+            continue
+
+        value = render_field_value(field["value"], variables)
+
+        if value is None:
+            return None
+
+        fields[index] = {**field, "value": value}
+
+    return fields
+
+
+FIELD_KEYS = tuple(BlockData.__annotations__)
+
+
+@overload
+def parse_code(code: str, variables: Mapping[str, str]) -> BlockData: ...
+
+
+@overload
+def parse_code(
+    code: str, variables: Mapping[str, str], *, fields: Collection[str]
+) -> PartialBlockData: ...
+
+
+def parse_code(
+    code: str,
+    variables: Mapping[str, str],
+    *,
+    fields: Collection[str] | None = None,
+) -> BlockData | PartialBlockData:
+    """
+    Parse a block source. With `fields`, only those fields are parsed and
+    returned, see `parse_projection`.
+    """
+    keys = None
+
+    if isinstance(fields, str):
+        raise TypeError("fields must be a collection of field names, not a string")
+
+    if fields is not None:
+        keys = frozenset(fields)
+        invalid_keys = sorted(keys.difference(FIELD_KEYS))
+
+        if invalid_keys:
+            raise ValueError(f"Invalid field: '{invalid_keys[0]}'")
+
+    split: Iterable[Field] | None = None
+
+    if "{" not in code and "}" not in code:
+        split = split_fields(code, keys=keys)
+    elif len(code) >= FIELD_VARIABLES_MIN_SIZE:
+        split = _apply_field_variables(code, variables)
+
+    if split is None:
+        split = split_fields(apply_variables(code, variables), keys=keys)
+
+    if keys is None:
+        return parse_fields(split)
+
+    return parse_projection(split, keys)
+
+
+def parse_block(code: str, variables: Mapping[str, str]) -> Block:
+    """Same as `parse_code`, returning the compact `Block` form."""
+    return Block.from_data(parse_code(code, variables))
+
+
+def parse_fields(fields: Iterable[Field]) -> BlockData:
     partial_block_data: PartialBlockData = {}
 
     for field in fields:
         partial_block_data.update(parse_field(field))
 
+    return build_block_data(partial_block_data)
+
+
+def build_block_data(partial_block_data: PartialBlockData) -> BlockData:
     try:
         block_data: BlockData = {
             "title": partial_block_data["title"],
@@ -87,3 +178,35 @@ def parse_code(code: str, variables: dict[str, str]) -> BlockData:
         raise ValueError(f"Missing required field: {error}")
 
     return block_data
+
+
+def parse_projection(
+    fields: Iterable[Field], keys: Collection[str]
+) -> PartialBlockData:
+    """
+    Same as `parse_fields` restricted to `keys`, without parsing the values of
+    the other fields. Those are only checked to have a valid key, and the
+    required fields to be present.
+    """
+    partial_block_data: PartialBlockData = {}
+    present_keys = set()
+
+    for field in fields:
+        key = field["key"].strip().lower()
+
+        if key not in FIELD_KEYS:
+            raise ValueError(f"Invalid key: '{field["key"]}'")
+
+        present_keys.add(key)
+
+        if key in keys:
+            partial_block_data.update(parse_field(field))
+
+    for key in ("title", "schedule"):
+        if key not in present_keys:
+            raise ValueError(f"Missing required field: '{key}'")
+
+    return cast(
+        PartialBlockData,
+        {key: partial_block_data.get(key) for key in FIELD_KEYS if key in keys},
+    )
@@ -0,0 +1,328 @@
+import heapq
+import asyncio
+import logging
+import datetime
+from typing import Callable, Protocol
+from .block import BlockData
+from .date import BaseDependency, base_dependency
+from .evaluator import CompiledSchedule, to_timestamp
+from .zone import get_zone
+
+Callback = Callable[[str, datetime.datetime], None]
+ErrorCallback = Callable[[str, datetime.datetime, Exception], None]
+
+logger = logging.getLogger(__name__)
+
+# Timer kinds, in the order timers due at the same instant fire
+_TRANSITION = 0
+_RECOMPILE = 1
+
+# `(timestamp, block_id, version, kind, date, evaluation)`, where a timer is
+# stale once its version is no longer the block's current one
+_Timer = tuple[int, str, int, int, datetime.datetime, bool]
+
+# From least to most dependent on the relative base
+_DEPENDENCIES: tuple[BaseDependency, ...] = ("absolute", "date", "exact")
+
+# `(version, compiled_schedule, block_data, dependency)`, where `dependency` is
+# how much of the relative base the schedule depends on when the base follows
+# the clock, and `None` otherwise
+_Block = tuple[int, CompiledSchedule, BlockData, BaseDependency | None]
+
+
+class Clock(Protocol):
+    def now(self) -> datetime.datetime: ...
+
+    async def sleep_until(self, date: datetime.datetime) -> None: ...
+
+
+class SystemClock:
+    def now(self) -> datetime.datetime:
+        return datetime.datetime.now(tz=datetime.timezone.utc)
+
+    async def sleep_until(self, date: datetime.datetime) -> None:
+        # Event loops may wake slightly early, so keep sleeping until it is due
+        while (now := self.now()) < date:
+            await asyncio.sleep((date - now).total_seconds())
+
+
+class ManualClock:
+    """A clock that only moves when `advance` or `set` is called."""
+
+    def __init__(self, now: datetime.datetime) -> None:
+        self._now = now
+        self._changed = asyncio.Event()
+
+    def now(self) -> datetime.datetime:
+        return self._now
+
+    def set(self, now: datetime.datetime) -> None:
+        self._now = now
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def advance(self, delta: datetime.timedelta) -> None:
+        self.set(self._now + delta)
+
+    async def sleep_until(self, date: datetime.datetime) -> None:
+        while self._now < date:
+            await self._changed.wait()
+
+
+class Scheduler:
+    """
+    Fires `on_set` and `on_end` at the instants blocks change evaluation.
+
+    Each block's schedule is compiled against the relative base it was added
+    with, and only its next transition is kept in a timer heap. Adding,
+    updating and removing a block are O(log n): replaced timers are left in
+    the heap and skipped once popped.
+
+    Blocks added without a relative base are compiled against the current
+    time, so schedules with relative dates are compiled again as it moves:
+    those that only depend on the base's date (such as `9:00 AM`) once that
+    date changes in the block's timezone, and the others (such as `in 1 hour`)
+    once their last transition has fired.
+
+    An exception raised by a callback is passed to `on_error` with the block
+    ID and date, or logged if there is none, and later transitions still fire.
+    """
+
+    def __init__(
+        self,
+        *,
+        on_set: Callback,
+        on_end: Callback,
+        on_error: ErrorCallback | None = None,
+        clock: Clock | None = None,
+    ) -> None:
+        self.on_set = on_set
+        self.on_end = on_end
+        self.on_error = on_error
+        self.clock: Clock = SystemClock() if clock is None else clock
+        self._heap: list[_Timer] = []
+        self._blocks: dict[str, _Block] = {}
+        self._evaluations: dict[str, bool] = {}
+        self._version = 0
+        self._stale = 0
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __contains__(self, block_id: str) -> bool:
+        return block_id in self._blocks
+
+    def is_active(self, block_id: str) -> bool:
+        return self._evaluations[block_id]
+
+    def add(
+        self,
+        block_id: str,
+        block_data: BlockData,
+        *,
+        relative_base: datetime.datetime | None = None,
+    ) -> None:
+        """
+        Add a block, or replace its schedule if it was already added.
+
+        Relative dates are resolved against `relative_base`, which defaults to
+        the current time. No callback fires for the state a new block starts
+        in, but replacing a block fires one if its current evaluation changed.
+        """
+        now = self.clock.now()
+        dependency: BaseDependency | None = None
+
+        if relative_base is None:
+            dependency = max(
+                (
+                    base_dependency(date_string)
+                    for _, date_string in block_data["schedule"]
+                    if date_string is not None
+                ),
+                key=_DEPENDENCIES.index,
+                default="absolute",
+            )
+
+        previous_evaluation = self._evaluations.get(block_id)
+        self.remove(block_id)
+        self._compile(
+            block_id,
+            block_data,
+            dependency,
+            now if relative_base is None else relative_base,
+            now,
+        )
+
+        if previous_evaluation is not None:
+            self._fire_if_changed(block_id, now, previous_evaluation)
+
+    def remove(self, block_id: str) -> None:
+        if self._blocks.pop(block_id, None) is None:
+            return
+
+        del self._evaluations[block_id]
+        self._stale += 1
+
+        # Rebuilding once most timers are stale keeps removal amortized O(1)
+        # without letting the heap grow with every update
+        if self._stale > len(self._heap) // 2:
+            self._heap = [
+                timer
+                for timer in self._heap
+                if timer[1] in self._blocks and self._blocks[timer[1]][0] == timer[2]
+            ]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def next_due(self) -> datetime.datetime | None:
+        """Date of the next transition of any block."""
+        self._drop_stale()
+        return self._heap[0][4] if self._heap else None
+
+    def fire_due(self) -> int:
+        """
+        Fire every transition up to the current time, returning how many.
+
+        Blocks due to be compiled again are compiled against the instant that
+        was due, and fire a callback if that changes their evaluation.
+        """
+        timestamp = to_timestamp(self.clock.now())
+        fired = 0
+
+        while self._drop_stale() and self._heap[0][0] <= timestamp:
+            _, block_id, _, kind, date, evaluation = heapq.heappop(self._heap)
+
+            if kind == _RECOMPILE:
+                _, _, block_data, dependency = self._blocks[block_id]
+                previous_evaluation = self._evaluations[block_id]
+                self._compile(block_id, block_data, dependency, date, date)
+                fired += self._fire_if_changed(block_id, date, previous_evaluation)
+                continue
+
+            # The next timer is queued before the callback runs, so the
+            # scheduler stays consistent whatever the callback does
+            self._evaluations[block_id] = evaluation
+
+            has_next = self._schedule(block_id, date)
+
+            if not has_next and self._blocks[block_id][3] == "exact":
+                # Compiled again once its last transition has fired, but not
+                # when it has none left to begin with, since the base is the
+                # same then
+                self._push(date, block_id, _RECOMPILE, False)
+
+            self._fire(block_id, date, evaluation)
+            fired += 1
+
+        return fired
+
+    async def run(self) -> None:
+        """Fire transitions as they become due, until cancelled."""
+        while True:
+            self.fire_due()
+            self._wakeup.clear()
+            due = self.next_due()
+            waiters = {asyncio.ensure_future(self._wait_for_wakeup())}
+
+            if due is not None:
+                waiters.add(asyncio.ensure_future(self.clock.sleep_until(due)))
+
+            try:
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+
+    async def _wait_for_wakeup(self) -> None:
+        await self._wakeup.wait()
+
+    def _compile(
+        self,
+        block_id: str,
+        block_data: BlockData,
+        dependency: BaseDependency | None,
+        relative_base: datetime.datetime,
+        now: datetime.datetime,
+    ) -> None:
+        """
+        Compile a block against `relative_base` as a new version, queueing its
+        next transition after `now` and, if its dates depend on the base's
+        date, a timer to compile it again once that date changes.
+        """
+        compiled_schedule = CompiledSchedule.from_block(block_data, relative_base)
+
+        self._version += 1
+        self._blocks[block_id] = (
+            self._version,
+            compiled_schedule,
+            block_data,
+            dependency,
+        )
+        self._evaluations[block_id] = compiled_schedule.evaluate(now)[0]
+        self._schedule(block_id, now)
+
+        if dependency == "date":
+            tzinfo = get_zone(block_data["timezone"]).tzinfo
+            base_date = relative_base.astimezone(tzinfo).date()
+            date = datetime.datetime.combine(
+                base_date + datetime.timedelta(days=1), datetime.time(), tzinfo
+            )
+            self._push(date, block_id, _RECOMPILE, False)
+
+    def _schedule(self, block_id: str, after: datetime.datetime) -> bool:
+        """Queue the block's next transition, returning whether it has one."""
+        transition = self._blocks[block_id][1].next_transition(after)
+
+        if transition is None:
+            return False
+
+        self._push(transition["date"], block_id, _TRANSITION, transition["evaluation"])
+        return True
+
+    def _push(
+        self, date: datetime.datetime, block_id: str, kind: int, evaluation: bool
+    ) -> None:
+        version = self._blocks[block_id][0]
+        heapq.heappush(
+            self._heap, (to_timestamp(date), block_id, version, kind, date, evaluation)
+        )
+
+        # A sleeping `run` may now have an earlier timer to wait for
+        self._wakeup.set()
+
+    def _drop_stale(self) -> bool:
+        while self._heap:
+            _, block_id, version, _, _, _ = self._heap[0]
+            current = self._blocks.get(block_id)
+
+            if current is not None and current[0] == version:
+                return True
+
+            heapq.heappop(self._heap)
+            self._stale = max(self._stale - 1, 0)
+
+        return False
+
+    def _fire_if_changed(
+        self, block_id: str, date: datetime.datetime, previous_evaluation: bool
+    ) -> int:
+        evaluation = self._evaluations[block_id]
+
+        if evaluation == previous_evaluation:
+            return 0
+
+        self._fire(block_id, date, evaluation)
+        return 1
+
+    def _fire(self, block_id: str, date: datetime.datetime, evaluation: bool) -> None:
+        try:
+            if evaluation:
+                self.on_set(block_id, date)
+            else:
+                self.on_end(block_id, date)
+        except Exception as error:
+            if self.on_error is None:
+                logger.exception("Callback for block %r at %s failed", block_id, date)
+            else:
+                self.on_error(block_id, date, error)
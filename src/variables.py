@@ -1,7 +1,318 @@
-def apply_variables(code: str, variables: dict[str, str]) -> str:
+import string
+import hashlib
+from typing import Callable, Iterable, Iterator, Mapping
+from .cache import LRUCache
+
+_formatter = string.Formatter()
+
+
+def apply_variables(code: str, variables: Mapping[str, str]) -> str:
+    """
+    Fill in the `{name}` placeholders of a block source.
+
+    Mappings other than a `dict`, such as `LazyVariables`, are only asked for
+    the variables the source references.
+    """
+    if not isinstance(variables, dict):
+        return render(get_template(code), variables)
+
     try:
         new_code = code.format(**variables)
     except KeyError as error:
         raise ValueError(f"Variable {error} is undefined")
 
     return new_code
+
+
+def _root_name(field_name: str) -> str:
+    # The variable a field looks up, before any attribute or index access
+    return field_name.partition(".")[0].partition("[")[0]
+
+
+def _is_positional(name: str) -> bool:
+    return not name or name.isdecimal()
+
+
+class Template:
+    """
+    A block source with its placeholders parsed once, for `render`.
+
+    The source is kept as alternating literal text and field values, so a
+    render only looks the values up and joins. Plain `{name}` fields are read
+    from the variables directly, while fields with attribute or index access,
+    a conversion or a format spec are formatted one by one as `str.format`
+    would. `referenced` holds the names of the variables a render looks up.
+    """
+
+    __slots__ = (
+        "code",
+        "referenced",
+        "_pieces",
+        "_names",
+        "_fields",
+        "_error",
+        "_spans_lines",
+    )
+
+    def __init__(self, code: str) -> None:
+        self.code = code
+        self._pieces: list[str] = []
+        self._names: list[str] = []
+        self._fields: dict[int, tuple[str, bool]] = {}
+        self._error: str | None = None
+        self._spans_lines = False
+        referenced: set[str] = set()
+        literal = ""
+
+        try:
+            for literal_text, field_name, format_spec, conversion in _formatter.parse(
+                code
+            ):
+                # Escaped braces come as literal text of their own
+                literal += literal_text
+
+                if field_name is None:
+                    continue
+
+                # The field value is filled in by `render`
+                self._pieces += (literal, "")
+                literal = ""
+                names = [_root_name(field_name)]
+
+                if "\n" in f"{field_name}{format_spec}{conversion}":
+                    self._spans_lines = True
+
+                try:
+                    for _, nested_name, _, _ in _formatter.parse(format_spec or ""):
+                        if nested_name is not None:
+                            names.append(_root_name(nested_name))
+                except ValueError:
+                    # Left for `str.format` to report when rendering
+                    pass
+
+                referenced.update(name for name in names if not _is_positional(name))
+
+                if (
+                    conversion is None
+                    and not format_spec
+                    and field_name == names[0]
+                    and not _is_positional(field_name)
+                ):
+                    self._names.append(field_name)
+                    continue
+
+                field = field_name
+
+                if conversion is not None:
+                    field += f"!{conversion}"
+
+                if format_spec:
+                    field += f":{format_spec}"
+
+                positional = any(_is_positional(name) for name in names)
+                self._fields[len(self._names)] = (f"{{{field}}}", positional)
+                self._names.append(field_name)
+        except ValueError as error:
+            # `str.format` fails at the same point, once the fields before it
+            # are formatted
+            self._error = str(error)
+
+        self._pieces.append(literal)
+        self.referenced = frozenset(referenced)
+
+
+def compile_template(code: str) -> Template:
+    return Template(code)
+
+
+template_cache: LRUCache[bytes, Template] = LRUCache(maxsize=1024)
+
+
+def get_template(code: str) -> Template:
+    """Same as `compile_template`, cached by a hash of the source."""
+    key = hashlib.sha256(code.encode("utf-8", "surrogatepass")).digest()
+    template = template_cache.get(key)
+
+    if template is None:
+        template = Template(code)
+        template_cache.put(key, template)
+
+    return template
+
+
+def referenced_variables(code: str) -> frozenset[str]:
+    """Names of the variables `apply_variables` looks up for a block source."""
+    return get_template(code).referenced
+
+
+class VariableIndex:
+    """
+    Which blocks reference each variable, from the placeholders of their
+    sources.
+
+    Blocks that reference a variable which is not defined yet are indexed
+    too, so defining it later invalidates them like any other change.
+    """
+
+    def __init__(self) -> None:
+        self._block_ids: dict[str, set[str]] = {}
+        self._names: dict[str, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, block_id: str) -> bool:
+        return block_id in self._names
+
+    def insert(self, block_id: str, code: str) -> None:
+        """Add a block, replacing its previous source if it was indexed."""
+        self.remove(block_id)
+        names = referenced_variables(code)
+
+        for name in names:
+            self._block_ids.setdefault(name, set()).add(block_id)
+
+        self._names[block_id] = names
+
+    def remove(self, block_id: str) -> None:
+        for name in self._names.pop(block_id, ()):
+            block_ids = self._block_ids[name]
+            block_ids.discard(block_id)
+
+            if not block_ids:
+                del self._block_ids[name]
+
+    def variables_of(self, block_id: str) -> frozenset[str]:
+        return self._names.get(block_id, frozenset())
+
+    def invalidate_variable(self, name: str) -> set[str]:
+        """IDs of the blocks to parse and evaluate again once `name` changes."""
+        return set(self._block_ids.get(name, ()))
+
+
+class LazyVariables(Mapping[str, str]):
+    """
+    Variables whose values are loaded on first access and then kept.
+
+    `loaders` maps each variable name to a function returning its value, so
+    rendering a block only loads the variables it references.
+    """
+
+    __slots__ = ("_loaders", "_values")
+
+    def __init__(self, loaders: Mapping[str, Callable[[], str]]) -> None:
+        self._loaders = loaders
+        self._values: dict[str, str] = {}
+
+    def __getitem__(self, name: str) -> str:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+
+        value = self._values[name] = self._loaders[name]()
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+    @property
+    def loaded(self) -> frozenset[str]:
+        return frozenset(self._values)
+
+
+def _field_values(template: Template, variables: Mapping[str, str]) -> list[str]:
+    values = []
+
+    for index, name in enumerate(template._names):
+        field = template._fields.get(index)
+
+        if field is None:
+            values.append(variables[name])
+            continue
+
+        format_string, positional = field
+
+        # Positional fields fail either way, exactly as `str.format` reports it
+        if positional:
+            values.append(format_string.format(**variables))
+        else:
+            values.append(format_string.format_map(variables))
+
+    return values
+
+
+def _render_pieces(template: Template, variables: Mapping[str, str]) -> list[str]:
+    pieces = template._pieces.copy()
+
+    # `str.format(**variables)` copies dicts, so subclasses such as
+    # `defaultdict` never get to fill in missing variables
+    if isinstance(variables, dict) and type(variables) is not dict:
+        variables = dict(variables)
+
+    try:
+        if template._fields:
+            pieces[1::2] = _field_values(template, variables)
+        else:
+            pieces[1::2] = [variables[name] for name in template._names]
+    except KeyError as error:
+        raise ValueError(f"Variable {error} is undefined")
+
+    if template._error is not None:
+        raise ValueError(template._error)
+
+    return pieces
+
+
+def render(template: Template, variables: Mapping[str, str]) -> str:
+    """Same as `apply_variables(template.code, variables)`."""
+    pieces = _render_pieces(template, variables)
+
+    try:
+        return "".join(pieces)
+    except TypeError:
+        # Values other than strings are formatted as `str.format` would
+        return "".join([format(piece, "") for piece in pieces])
+
+
+def _is_inert(value: str) -> bool:
+    # Substituting it cannot open or close a multiline value, empty a value or
+    # add a line
+    return value.splitlines() == [value] and not value.isspace() and '"' not in value
+
+
+def render_field_value(value: str, variables: Mapping[str, str]) -> str | None:
+    """
+    Fill in the placeholders of a single field value, or `None` when that could
+    differ from filling in the whole source and splitting it again.
+
+    That is the case when the value cannot be parsed on its own, when a
+    placeholder spans lines or when a substituted text is empty, blank, or has
+    a line break or a quote.
+    """
+    template = get_template(value)
+
+    if template._error is not None or template._spans_lines:
+        return None
+
+    pieces = _render_pieces(template, variables)
+
+    for index in range(1, len(pieces), 2):
+        piece = pieces[index]
+
+        if type(piece) is not str:
+            piece = pieces[index] = format(piece, "")
+
+        if not _is_inert(piece):
+            return None
+
+    return "".join(pieces)
+
+
+def render_many(
+    template: Template, variable_sets: Iterable[Mapping[str, str]]
+) -> list[str]:
+    return [render(template, variables) for variables in variable_sets]
@@ -0,0 +1,36 @@
+import datetime
+import functools
+
+
+class Zone:
+    """
+    A timezone name resolved once, as `dateutil.tz.gettz` resolves it.
+
+    Zones are interned by `get_zone`, so the same name always gives the same
+    handle and passing a handle around skips resolving the name again.
+    """
+
+    __slots__ = ("name", "tzinfo")
+
+    def __init__(self, name: str, tzinfo: datetime.tzinfo | None) -> None:
+        self.name = name
+        self.tzinfo = tzinfo
+
+    def __repr__(self) -> str:
+        return f"Zone({self.name!r})"
+
+
+@functools.cache
+def _resolve_zone(name: str) -> Zone:
+    # Deferred so that importing the package stays cheap
+    import dateutil.tz
+
+    return Zone(name, dateutil.tz.gettz(name))
+
+
+def get_zone(timezone: str | Zone | None) -> Zone:
+    """The zone handle for a timezone name, defaulting to UTC."""
+    if isinstance(timezone, Zone):
+        return timezone
+
+    return _resolve_zone(timezone or "UTC")
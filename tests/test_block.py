@@ -0,0 +1,77 @@
+import dataclasses
+import pytest
+from src.block import Block, BlockData
+from src.parser import parse_block, parse_code
+
+CODE = '''Title: {name}
+Notes: Some notes
+Tags: work, deep
+Tasks: """
+Write tests
+Ship it
+"""
+Timezone: UTC+8
+Schedule: """
+set 9:00 AM
+end 5:00 PM
+set
+"""'''
+
+
+class TestBlock:
+    def test_round_trip(self) -> None:
+        for code in [CODE, "Title: Minimal\nSchedule: set"]:
+            block_data = parse_code(code, {"name": "Block"})
+            block = Block.from_data(block_data)
+
+            assert block.to_data() == block_data
+            assert Block.from_data(block.to_data()) == block
+
+    def test_fields(self) -> None:
+        block = parse_block(CODE, {"name": "Block"})
+
+        assert block.title == " Block"
+        assert block.notes == " Some notes"
+        assert block.tags == frozenset({"work", "deep"})
+        assert block.tasks == ("Write tests", "Ship it")
+        assert block.timezone == "UTC+8"
+        assert block.schedule == (("set", "9:00 AM"), ("end", "5:00 PM"), ("set", None))
+
+    def test_optional_fields(self) -> None:
+        block = parse_block("Title: Minimal\nSchedule: set", {})
+
+        assert block.notes is None
+        assert block.tags is None
+        assert block.tasks is None
+        assert block.timezone is None
+
+    def test_interned(self) -> None:
+        first = parse_block(CODE, {"name": "A"})
+        second = parse_block(CODE, {"name": "B"})
+        assert first.tags is not None and second.tags is not None
+
+        assert [tag for tag in first.tags if tag == "work"][0] is [
+            tag for tag in second.tags if tag == "work"
+        ][0]
+        assert first.timezone is second.timezone
+        assert first.schedule[0][1] is second.schedule[0][1]
+
+    def test_immutable(self) -> None:
+        block = parse_block(CODE, {"name": "Block"})
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            block.title = "Other"  # type: ignore[misc]
+
+        assert not hasattr(block, "__dict__")
+        assert hash(block) == hash(parse_block(CODE, {"name": "Block"}))
+
+    def test_to_data_copies(self) -> None:
+        block = parse_block(CODE, {"name": "Block"})
+        block_data: BlockData = block.to_data()
+        assert block_data["tags"] is not None
+
+        block_data["tags"].add("other")
+        block_data["schedule"].clear()
+
+        assert block.tags == frozenset({"work", "deep"})
+        assert len(block.schedule) == 3
@@ -0,0 +1,105 @@
+from concurrent.futures import ProcessPoolExecutor
+from src import bulk
+from src.bulk import BlockSource, evaluate_blocks, shutdown_pools
+from tests.utils import parse_date
+
+WORK_BLOCK = """
+Title: Work
+Timezone: UTC+8
+Schedule: \"\"\"
+set 9:00 AM
+end 5:00 PM
+\"\"\"
+"""
+
+SLEEP_BLOCK = """
+Title: Sleep
+Schedule: \"\"\"
+end 7:00 AM
+set 11:00 PM
+\"\"\"
+"""
+
+
+class TestEvaluateBlocks:
+    def teardown_method(self) -> None:
+        shutdown_pools()
+
+    def test_in_process(self) -> None:
+        evaluation_date = parse_date("Aug 14, 2025 at 2 AM")
+        results = evaluate_blocks(
+            [(WORK_BLOCK, {}), (SLEEP_BLOCK, {})], evaluation_date, workers=1
+        )
+
+        assert [result["evaluation"] for result in results] == [True, False]
+        assert results[0]["matched_date"] == parse_date(
+            "Aug 14, 2025 at 9 AM", timezone="UTC+8"
+        )
+        assert results[1]["matched_date"] is None
+        assert results[0]["block"] is not None
+        assert results[0]["block"]["title"] == " Work"
+        assert all(result["error"] is None for result in results)
+
+    def test_errors_are_captured(self) -> None:
+        blocks: list[BlockSource] = [
+            ("Title: {name}\nSchedule: set", {}),
+            ("Title: Broken\nSchedule: set every 6 months", {}),
+            ("Title: Fine\nSchedule: set", {}),
+        ]
+        results = evaluate_blocks(blocks, parse_date("Aug 14, 2025"), workers=1)
+
+        assert str(results[0]["error"]) == "Variable 'name' is undefined"
+        assert str(results[1]["error"]) == "Failed parsing 'every 6 months'"
+        assert results[1]["block"] is None
+        assert results[2]["error"] is None
+        assert results[2]["evaluation"] is True
+
+    def test_process_pool_keeps_input_order(self) -> None:
+        evaluation_date = parse_date("Aug 14, 2025 at 2 AM")
+        blocks: list[BlockSource] = [
+            (
+                "Title: {index}\nSchedule: set {hour}:00 AM",
+                {"index": str(index), "hour": str(hour)},
+            )
+            for index, hour in enumerate([1, 3] * 20)
+        ]
+        blocks.insert(7, ("Title: Broken", {}))
+
+        results = evaluate_blocks(blocks, evaluation_date, workers=2)
+        expected = evaluate_blocks(blocks, evaluation_date, workers=1)
+
+        assert len(results) == len(blocks)
+        assert [
+            (result["evaluation"], result["matched_date"], result["block"])
+            for result in results
+        ] == [
+            (result["evaluation"], result["matched_date"], result["block"])
+            for result in expected
+        ]
+        assert str(results[7]["error"]) == "Missing required field: 'schedule'"
+
+    def test_pool_is_kept_between_calls(self) -> None:
+        evaluation_date = parse_date("Aug 14, 2025 at 10 AM")
+        blocks: list[BlockSource] = [(WORK_BLOCK, {})] * 4
+
+        evaluate_blocks(blocks, evaluation_date, workers=2)
+        pool = bulk._pools[2]
+        results = evaluate_blocks(blocks, evaluation_date, workers=2)
+
+        assert bulk._pools[2] is pool
+        assert [result["evaluation"] for result in results] == [False] * 4
+
+        shutdown_pools()
+
+        assert bulk._pools == {}
+
+    def test_long_lived_executor(self) -> None:
+        evaluation_date = parse_date("Aug 14, 2025 at 10 AM")
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for _ in range(2):
+                results = evaluate_blocks(
+                    [(WORK_BLOCK, {})] * 4, evaluation_date, executor=executor
+                )
+
+                assert [result["evaluation"] for result in results] == [False] * 4
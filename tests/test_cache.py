@@ -0,0 +1,66 @@
+import time
+import pytest
+from src.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_get_and_put(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.evictions == 1
+
+    def test_shrinking_maxsize_evicts(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(maxsize=3)
+
+        for index, key in enumerate("abc"):
+            cache.put(key, index)
+
+        cache.maxsize = 1
+
+        assert len(cache) == 1
+        assert "c" in cache
+        assert cache.evictions == 2
+
+    def test_zero_maxsize_disables_caching(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(maxsize=0)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+
+    def test_negative_maxsize(self) -> None:
+        with pytest.raises(ValueError, match="maxsize cannot be negative"):
+            LRUCache(maxsize=-1)
+
+    def test_ttl(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(maxsize=2, ttl=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.evictions == 1
+        assert len(cache) == 0
+
+    def test_clear(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
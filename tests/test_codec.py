@@ -0,0 +1,158 @@
+import pytest
+from src.block import ScheduleEntry
+from src.codec import (
+    MAGIC,
+    decode_block,
+    decode_schedule,
+    encode_block,
+    encode_schedule,
+)
+from src.evaluator import CompiledSchedule
+from src.parser import parse_code
+from tests.utils import parse_date
+
+SOURCES = [
+    (
+        '''
+
+Title: Test {function_name}
+Notes: Notes are totally optional,    yah
+Tags: nuh, uh
+
+Tasks: """
+Write a test for {function_name}
+Do more coding
+Fix bugs
+"""
+
+Schedule: """
+set
+"""
+
+''',
+        {"function_name": "parse_code"},
+    ),
+    ("Title: Minimal Block\n" 'Schedule: """\n' "set 2025-01-01\n" '"""', {}),
+    (
+        "Title: {project_name} Project\n"
+        "Notes: Working on {project_name} since {start_date}\n"
+        "Tags: {priority}, {category}\n"
+        'Tasks: """\n'
+        "Complete {task1}\n"
+        "Review {task2}\n"
+        '"""\n'
+        'Schedule: """\n'
+        "set {start_date}\n"
+        "end {end_date}\n"
+        '"""',
+        {
+            "project_name": "WatDo",
+            "start_date": "2025-01-01",
+            "end_date": "2025-01-31",
+            "priority": "high",
+            "category": "engine",
+            "task1": "parser implementation",
+            "task2": "test coverage",
+        },
+    ),
+    ("Title: Empty Tags\nTags: ,,\nTasks: \nSchedule: set", {}),
+    (
+        "Title: Multiline Test\n"
+        'Notes: """\n'
+        "This is a multiline\n"
+        "note with multiple\n"
+        "lines of content\n"
+        '"""\n'
+        "Timezone: Asia/Tokyo\n"
+        'Schedule: """\n'
+        "set 2025-01-01 -> in 2 days\n"
+        "end 2025-01-15\n"
+        "end\n"
+        '"""',
+        {},
+    ),
+    ("Title: Ünïcödé ✓ 日本語\nNotes: émoji 🎉\nSchedule: set", {}),
+]
+
+
+class TestBlockCodec:
+    def test_round_trip(self) -> None:
+        for code, variables in SOURCES:
+            block_data = parse_code(code, variables)
+            data = encode_block(block_data)
+
+            assert data.startswith(MAGIC)
+            assert decode_block(data) == block_data
+
+    def test_deterministic(self) -> None:
+        code = "Title: Tags\nTags: c, a, b\nSchedule: set"
+
+        assert encode_block(parse_code(code, {})) == encode_block(parse_code(code, {}))
+
+    def test_invalid(self) -> None:
+        data = encode_block(parse_code(*SOURCES[0]))
+
+        with pytest.raises(ValueError, match="Not an encoded watdo payload"):
+            decode_block(b"junk" + data)
+
+        with pytest.raises(ValueError, match="Unsupported format version: 99"):
+            decode_block(MAGIC + bytes([99]) + data[len(MAGIC) + 1 :])
+
+        with pytest.raises(ValueError, match="truncated"):
+            decode_block(data[:-1])
+
+        with pytest.raises(ValueError, match="trailing bytes"):
+            decode_block(data + b"\0")
+
+        with pytest.raises(ValueError, match="another kind"):
+            decode_schedule(data)
+
+
+class TestScheduleCodec:
+    def test_round_trip(self) -> None:
+        base_date = parse_date("Jan 1 2025")
+        evaluation_dates = [
+            parse_date(date)
+            for date in [
+                "Dec 1 2024",
+                "Jan 1 2025",
+                "Jan 3 2025",
+                "Jan 10 2025",
+                "Jan 15 2025",
+                "Jan 15 2025 00:00:01",
+                "Feb 1 2025",
+            ]
+        ]
+
+        for code, variables in SOURCES:
+            block_data = parse_code(code, variables)
+            compiled = CompiledSchedule.from_block(block_data, base_date)
+            decoded = decode_schedule(encode_schedule(compiled))
+
+            assert decoded.intervals() == compiled.intervals()
+
+            for evaluation_date in evaluation_dates:
+                evaluation, matched_date = decoded.evaluate(evaluation_date)
+                expected_evaluation, expected_date = compiled.evaluate(evaluation_date)
+
+                assert (evaluation, matched_date) == (
+                    expected_evaluation,
+                    expected_date,
+                )
+
+                if matched_date is not None and expected_date is not None:
+                    assert matched_date.utcoffset() == expected_date.utcoffset()
+
+    def test_unsorted_schedule(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", "Aug 20 2025"),
+            ("end", "Aug 5 2025"),
+            ("set", None),
+        ]
+        compiled = CompiledSchedule(schedule, parse_date("Jan 1 2025"))
+        decoded = decode_schedule(encode_schedule(compiled))
+
+        for date in ["Aug 1 2025", "Aug 5 2025", "Aug 10 2025", "Aug 20 2025"]:
+            assert decoded.evaluate(parse_date(date)) == compiled.evaluate(
+                parse_date(date)
+            )
@@ -1,6 +1,19 @@
 import datetime
+import dateparser
+import dateutil
 from datetime import timezone
-from src.date import parse_date_string
+from src.date import (
+    _DATE_PATTERN,
+    _parse_fast,
+    date_cache,
+    date_parsers,
+    set_date_languages,
+    parse_date_string,
+    base_dependency,
+    split_date_expression,
+    is_forward_segment,
+    resolve_date_segments,
+)
 from tests.utils import parse_date
 
 
@@ -240,3 +253,257 @@ class TestParseDateString:
         base = datetime.datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
         result = parse_date_string("15:30", base)
         assert result == datetime.datetime(2024, 1, 15, 15, 30, 0, tzinfo=timezone.utc)
+
+
+class TestDateCache:
+    def setup_method(self) -> None:
+        date_cache.clear()
+
+    def test_absolute_date_ignores_relative_base(self) -> None:
+        first = parse_date_string(
+            "Aug 1 2025", parse_date("Jan 1 2020"), timezone="Asia/Tokyo"
+        )
+        second = parse_date_string(
+            "Aug 1 2025", parse_date("Mar 3 2030"), timezone="Asia/Tokyo"
+        )
+
+        assert first == second == parse_date("Aug 1 2025", timezone="Asia/Tokyo")
+        assert (date_cache.hits, date_cache.misses) == (1, 1)
+
+    def test_relative_date_keyed_by_relative_base(self) -> None:
+        base = parse_date("Aug 10 2025")
+
+        assert parse_date_string("tomorrow", base) == parse_date("Aug 11 2025")
+        assert parse_date_string("tomorrow", base) == parse_date("Aug 11 2025")
+        assert parse_date_string("tomorrow", parse_date("Aug 11 2025")) == parse_date(
+            "Aug 12 2025"
+        )
+        assert (date_cache.hits, date_cache.misses) == (1, 2)
+
+    def test_time_of_day_keyed_by_base_date(self) -> None:
+        timezone = "America/New_York"
+
+        for date_string, expected in [
+            ("today at 9 AM", "Aug 10 2025 9:00"),
+            ("tomorrow at 5 PM", "Aug 11 2025 17:00"),
+            ("9 AM today", "Aug 10 2025 9:00"),
+        ]:
+            for base in [
+                "Aug 10 2025 4:00",
+                "Aug 10 2025 12:34:56",
+                "Aug 11 2025 3:59",
+            ]:
+                assert parse_date_string(
+                    date_string, parse_date(base), timezone=timezone
+                ) == parse_date(expected, timezone=timezone)
+
+        assert (date_cache.hits, date_cache.misses) == (6, 3)
+
+    def test_time_of_day_keyed_by_date_in_timezone(self) -> None:
+        """The base's date counts in the block timezone, not in UTC."""
+        timezone = "America/New_York"
+
+        for base, expected in [
+            ("Aug 10 2025 12:00", "Aug 10 2025 9:00"),
+            ("Aug 11 2025 2:00", "Aug 10 2025 9:00"),
+            ("Aug 11 2025 12:00", "Aug 11 2025 9:00"),
+        ]:
+            assert parse_date_string(
+                "today at 9 AM", parse_date(base), timezone=timezone
+            ) == parse_date(expected, timezone=timezone)
+
+        assert (date_cache.hits, date_cache.misses) == (1, 2)
+
+    def test_chained_time_of_day_keyed_by_exact_base(self) -> None:
+        expression = "Aug 10 2025 4:00 -> in 2 hours -> tomorrow at 9 AM"
+
+        assert parse_date_string(
+            expression, parse_date("Aug 1 2025"), timezone="Asia/Tokyo"
+        ) == parse_date("Aug 11 2025 9:00", timezone="Asia/Tokyo")
+        assert (
+            "tomorrow at 9 AM",
+            "Asia/Tokyo",
+            datetime.date(2025, 8, 10),
+        ) not in date_cache
+
+    def test_keyed_by_timezone(self) -> None:
+        assert parse_date_string("Aug 1 2025", timezone="EST") == parse_date(
+            "Aug 1 2025", timezone="EST"
+        )
+        assert parse_date_string("Aug 1 2025", timezone="PST") == parse_date(
+            "Aug 1 2025", timezone="PST"
+        )
+        assert date_cache.hits == 0
+
+    def test_chained_segments(self) -> None:
+        expression = "Aug 1 2025 -> in 2 days"
+
+        assert parse_date_string(expression) == parse_date("Aug 3 2025")
+        assert parse_date_string(expression) == parse_date("Aug 3 2025")
+        assert (date_cache.hits, date_cache.misses) == (1, 1)
+
+    def test_relative_date_without_base_is_not_cached(self) -> None:
+        parse_date_string("tomorrow")
+        parse_date_string("tomorrow")
+
+        assert len(date_cache) == 0
+
+
+class TestDateParsers:
+    def setup_method(self) -> None:
+        date_cache.clear()
+        date_parsers.clear()
+
+    def teardown_method(self) -> None:
+        set_date_languages(["en"])
+
+    def test_shared_by_relative_base(self) -> None:
+        base = parse_date("Aug 10 2025 12:00")
+
+        assert parse_date_string("tomorrow", base, timezone="EST") == parse_date(
+            "Aug 11 2025 7:00", timezone="EST"
+        )
+        assert parse_date_string("in 2 days", base, timezone="EST") == parse_date(
+            "Aug 12 2025 7:00", timezone="EST"
+        )
+        assert (date_parsers.hits, date_parsers.misses) == (1, 1)
+
+        parse_date_string("tomorrow", parse_date("Aug 11 2025"), timezone="EST")
+        parse_date_string("tomorrow", base, timezone="PST")
+
+        assert len(date_parsers) == 3
+
+    def test_languages(self) -> None:
+        assert parse_date_string("1 août 2025") is None
+
+        set_date_languages(["en", "fr"])
+
+        assert len(date_parsers) == 0
+        assert parse_date_string("1 août 2025") == parse_date("Aug 1 2025")
+        assert parse_date_string("August 1st, 2025") == parse_date("Aug 1 2025")
+
+
+class TestFastPath:
+    """
+    The fast path must agree with `dateparser` on every expression it accepts.
+    """
+
+    def assert_parity(
+        self,
+        date_string: str,
+        relative_base: datetime.datetime | None = None,
+        *,
+        timezone: str = "UTC",
+    ) -> None:
+        match = _DATE_PATTERN.match(date_string)
+        assert match is not None
+
+        if relative_base is not None:
+            relative_base = relative_base.astimezone(dateutil.tz.gettz(timezone))
+
+        date = _parse_fast(match, relative_base, timezone)
+        expected = dateparser.parse(
+            date_string,
+            settings={
+                "TIMEZONE": timezone,
+                "RETURN_AS_TIMEZONE_AWARE": True,
+                **({} if relative_base is None else {"RELATIVE_BASE": relative_base}),
+            },
+        )
+
+        assert date is not None
+        assert expected is not None
+        assert date == expected
+        assert date.utcoffset() == expected.utcoffset()
+
+    def test_absolute_dates(self) -> None:
+        for date_string in [
+            "Aug 1 2025",
+            "Aug 15 2025",
+            "Aug 1, 2025",
+            "August 1st, 2025",
+            "1 Aug 2025",
+            "2024-01-20",
+            "2025-08-15 09:00",
+            "2024-01-20 15:30",
+            "Aug 1 2025 10:00",
+            "Aug 1 2025 12:30:45",
+            "Aug 1, 2025 at 9:00 PM",
+            "Aug 14, 2025 at 9 AM",
+        ]:
+            for timezone in ["UTC", "UTC+8", "UTC-3", "UTC+5:30", "UTC+14", "GMT"]:
+                self.assert_parity(date_string, timezone=timezone)
+
+    def test_timezone_in_string(self) -> None:
+        for date_string in [
+            "Aug 1 2025 UTC+8",
+            "Aug 1 2025 10:00 UTC+3",
+            "Aug 1 2025 15:30 UTC+5",
+            "Aug 1 2025 10:00 UTC+2",
+            "Aug 1 2025 UTC+0530",
+        ]:
+            for timezone in ["UTC", "UTC+8", "UTC-3", "UTC+7"]:
+                self.assert_parity(date_string, timezone=timezone)
+
+    def test_time_only(self) -> None:
+        base = datetime.datetime(2024, 1, 15, 12, 7, 33, 123456, tzinfo=timezone.utc)
+
+        for date_string in ["9:00 AM", "11:00 AM", "15:30", "12:00 AM", "12 PM"]:
+            for tz in ["UTC", "UTC+8", "UTC-12"]:
+                self.assert_parity(date_string, base, timezone=tz)
+
+    def test_undecided(self) -> None:
+        base = datetime.datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+        for date_string, tz, relative_base in [
+            ("Aug 1 2025", "EST", None),
+            ("Aug 1 2025", "UTC+5:30:45", None),
+            ("Aug 1 2025 UTC+15", "UTC", None),
+            ("Feb 30 2025", "UTC", None),
+            ("Aug 1 2025 13:00 PM", "UTC", None),
+            ("9:00 AM", "UTC", None),
+            ("9:00 AM UTC+8", "UTC", base),
+        ]:
+            match = _DATE_PATTERN.match(date_string)
+            assert match is not None
+            assert _parse_fast(match, relative_base, tz) is None
+
+    def test_unsupported_forms(self) -> None:
+        for date_string in ["January 20th", "tomorrow", "in 2 days", "Aug 2025"]:
+            assert _DATE_PATTERN.match(date_string) is None
+
+
+class TestDateSegments:
+    def test_is_forward_segment(self) -> None:
+        for date_string in ["in 2 days", " In 1 Week ", "in 3 months", "in 1 year"]:
+            assert is_forward_segment(date_string)
+
+        for date_string in ["2 days ago", "in two days", "tomorrow", "Aug 1 2025"]:
+            assert not is_forward_segment(date_string)
+
+    def test_base_dependency(self) -> None:
+        for date_string in ["Aug 1 2025", "2025-08-01 9:00 -> in 2 days"]:
+            assert base_dependency(date_string) == "absolute"
+
+        for date_string in ["9:00 AM", "tomorrow at noon", "5 PM -> in 1 hour"]:
+            assert base_dependency(date_string) == "date"
+
+        for date_string in ["tomorrow", "in 2 days", "9:00 UTC+8", "next month"]:
+            assert base_dependency(date_string) == "exact"
+
+    def test_resolve_date_segments(self) -> None:
+        date_strings = split_date_expression("Aug 1 2025 -> in 2 days -> in 1 hour")
+
+        assert list(resolve_date_segments(date_strings, timezone="UTC+8")) == [
+            parse_date("Aug 1 2025", timezone="UTC+8"),
+            parse_date("Aug 3 2025", timezone="UTC+8"),
+            parse_date("Aug 3 2025 1:00", timezone="UTC+8"),
+        ]
+
+    def test_resolve_stops_on_failure(self) -> None:
+        date_strings = split_date_expression("Aug 1 2025 -> invalid -> in 2 days")
+
+        assert list(resolve_date_segments(date_strings)) == [
+            parse_date("Aug 1 2025"),
+            None,
+        ]
@@ -0,0 +1,88 @@
+import pytest
+from src.document import parse_document
+from src.parser import parse_code
+
+DOCUMENT = '''Title: Work
+Schedule: """
+set 9:00 AM
+end 5:00 PM
+"""
+---
+
+Title: Notes with a separator
+Notes: """
+Before
+---
+After
+"""
+Schedule: set
+
+---
+Title: Café {owner}
+Tags: a, b
+Schedule: set
+'''
+
+
+class TestParseDocument:
+    def test_blocks(self) -> None:
+        handles = list(parse_document(DOCUMENT, {"owner": "Ann"}))
+
+        assert [handle.title for handle in handles] == [
+            " Work",
+            " Notes with a separator",
+            " Café Ann",
+        ]
+        assert handles[1].block["notes"] == "\nBefore\n---\nAfter\n"
+        assert handles[2].block == parse_code(handles[2].code, {"owner": "Ann"})
+
+    def test_offsets(self) -> None:
+        handles = list(parse_document(DOCUMENT, {"owner": "Ann"}))
+        encoded = DOCUMENT.encode()
+        lines = DOCUMENT.splitlines()
+
+        assert [handle.line_no_range for handle in handles] == [
+            (1, 5),
+            (8, 14),
+            (17, 19),
+        ]
+
+        for handle in handles:
+            start, end = handle.byte_range
+            assert encoded[start:end].decode() == handle.code
+
+            first, last = handle.line_no_range
+            assert handle.code.splitlines() == lines[first - 1 : last]
+
+    def test_lazy(self) -> None:
+        document = (
+            "Title: Valid\nSchedule: set\n---\nTitle: {undefined}\n---\nnot a field"
+        )
+        handles = list(parse_document(document, {}))
+
+        assert len(handles) == 3
+        assert handles[0].title == " Valid"
+
+        with pytest.raises(ValueError, match="Variable 'undefined' is undefined"):
+            handles[1].title
+
+        with pytest.raises(ValueError, match="missing a colon .* in line 1"):
+            handles[2].block
+
+    def test_get_parses_only_requested_key(self) -> None:
+        document = "Title: Valid\nSchedule: start now\nTags: x, y"
+        (handle,) = parse_document(document, {})
+
+        assert handle.get("tags") == {"tags": {"x", "y"}}
+        assert "fields" not in handle.__dict__
+
+        with pytest.raises(ValueError, match="Invalid action: start"):
+            handle.block
+
+        assert handle.get("tags") == {"tags": {"x", "y"}}
+        assert handle.title == " Valid"
+
+    def test_blank_blocks_are_skipped(self) -> None:
+        assert list(parse_document("", {})) == []
+        assert list(parse_document("---\n\n---\n   \n", {})) == []
+        assert len(list(parse_document("---\nTitle: a\nSchedule: set\n---", {}))) == 1
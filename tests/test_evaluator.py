@@ -1,7 +1,17 @@
+import heapq
 import datetime
 import pytest
-from src.block import ScheduleEntry
-from src.evaluator import generate_timeline, evaluate_schedule
+from src.block import BlockData, ScheduleEntry
+from src.evaluator import (
+    CompiledSchedule,
+    generate_timeline,
+    evaluate_schedule,
+    evaluate_schedule_many,
+    next_transition,
+    upcoming_transitions,
+    validate_schedule,
+    to_timestamp,
+)
 from tests.utils import parse_date
 
 
@@ -713,3 +723,459 @@ class TestEvaluateSchedule:
             relative_base=base_date,
             evaluation_date=parse_date("Jul 1, 2025 at 9:00 AM"),
         ) == (True, parse_date("Jul 1, 2025 at 9:00 AM"))
+
+
+class TestCompiledSchedule:
+    def assert_matches_evaluate_schedule(
+        self,
+        schedule: list[ScheduleEntry],
+        relative_base: datetime.datetime,
+        evaluation_dates: list[datetime.datetime],
+    ) -> None:
+        compiled = CompiledSchedule(schedule, relative_base)
+
+        for evaluation_date in evaluation_dates:
+            assert compiled.evaluate(evaluation_date) == evaluate_schedule(
+                schedule,
+                relative_base=relative_base,
+                evaluation_date=evaluation_date,
+            )
+
+    def test_empty_schedule(self) -> None:
+        now = datetime.datetime.now()
+        assert CompiledSchedule([], now).evaluate(now) == (False, None)
+
+    def test_action_only(self) -> None:
+        now = datetime.datetime.now()
+        assert CompiledSchedule([("set", None)], now).evaluate(now) == (True, None)
+        assert CompiledSchedule([("end", None)], now).evaluate(now) == (False, None)
+
+    def test_arrays_round_trip(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", "Jan 1 2025 9:00"),
+            ("end", "Jul 1 2025 17:00"),
+            ("set", "Mar 1 2025"),
+        ]
+        base_date = parse_date("Jan 1 2025")
+        compiled = CompiledSchedule(schedule, base_date, timezone="Asia/Manila")
+        rebuilt = CompiledSchedule.from_arrays(*compiled.to_arrays())
+
+        assert rebuilt.to_arrays() == compiled.to_arrays()
+        assert rebuilt.intervals() == compiled.intervals()
+
+        for month in range(1, 9):
+            date = parse_date(f"{month}/15/2025")
+            assert rebuilt.evaluate(date) == compiled.evaluate(date)
+
+    def test_from_arrays_length_mismatch(self) -> None:
+        timestamps, offsets, actions, before, final = CompiledSchedule(
+            [("set", "Jan 1 2025")], parse_date("Jan 1 2025")
+        ).to_arrays()
+
+        with pytest.raises(ValueError, match="differ in length"):
+            CompiledSchedule.from_arrays(timestamps, offsets, actions, b"", final)
+
+    def test_matched_date_offset(self) -> None:
+        """Matched dates keep the wall time and offset they were parsed with."""
+        schedule: list[ScheduleEntry] = [
+            ("set", "Jan 1 2025 9:00"),
+            ("end", "Jul 1 2025 17:00"),
+        ]
+        base_date = parse_date("Jan 1 2025")
+        compiled = CompiledSchedule(schedule, base_date, timezone="America/New_York")
+
+        for evaluation_date in ["Feb 1 2025", "Aug 1 2025"]:
+            _, matched_date = compiled.evaluate(parse_date(evaluation_date))
+            _, expected_date = evaluate_schedule(
+                schedule,
+                relative_base=base_date,
+                evaluation_date=parse_date(evaluation_date),
+                timezone="America/New_York",
+            )
+
+            assert matched_date is not None and expected_date is not None
+            assert matched_date == expected_date
+            assert matched_date.utcoffset() == expected_date.utcoffset()
+            assert matched_date.replace(tzinfo=None) == expected_date.replace(
+                tzinfo=None
+            )
+
+    def test_invalid_date(self) -> None:
+        now = datetime.datetime.now()
+        with pytest.raises(ValueError, match="Failed parsing 'every 6 months'"):
+            CompiledSchedule([("set", "every 6 months")], now)
+
+    def test_schedule(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", None),
+            ("end", "Aug 1 2025"),
+            ("set", "Aug 15 2025"),
+            ("end", "Sep 1 2025"),
+            ("set", "Sep 15 2025"),
+            ("end", "Oct 1 2025"),
+            ("set", None),
+        ]
+
+        self.assert_matches_evaluate_schedule(
+            schedule,
+            parse_date("Jan 1, 2025"),
+            [
+                parse_date("July 31, 2025"),
+                parse_date("Aug 1, 2025"),
+                parse_date("Aug 14, 2025"),
+                parse_date("Aug 15, 2025"),
+                parse_date("Sep 30, 2025"),
+                parse_date("Oct 1, 2025"),
+                parse_date("Oct 2, 2025"),
+            ],
+        )
+
+    def test_unordered_schedule(self) -> None:
+        """
+        Entries past the evaluation date stop the walk even when later entries
+        are earlier, so the compiled schedule has to honour the entry order.
+        """
+        schedule: list[ScheduleEntry] = [
+            ("set", "Aug 1 2025"),
+            ("end", "Oct 1 2025"),
+            ("set", "Sep 1 2025"),
+            ("end", None),
+            ("set", "Oct 1 2025"),
+            ("end", "Jul 1 2025"),
+        ]
+
+        self.assert_matches_evaluate_schedule(
+            schedule,
+            parse_date("Jan 1, 2025"),
+            [
+                parse_date("Jun 30, 2025"),
+                parse_date("Jul 1, 2025"),
+                parse_date("Aug 1, 2025"),
+                parse_date("Sep 1, 2025"),
+                parse_date("Sep 15, 2025"),
+                parse_date("Oct 1, 2025"),
+                parse_date("Oct 2, 2025"),
+            ],
+        )
+
+    def test_same_day(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", "Oct 1 2025"),
+            ("end", "Oct 1 2025"),
+        ]
+
+        compiled = CompiledSchedule(schedule, parse_date("Jan 1, 2025"))
+        assert compiled.evaluate(parse_date("Oct 1, 2025")) == (
+            True,
+            parse_date("Oct 1 2025"),
+        )
+        assert compiled.evaluate(parse_date("Oct 1, 2025 1:00 AM")) == (
+            False,
+            parse_date("Oct 1 2025"),
+        )
+
+    def test_relativity(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", "9:00 AM"),
+            ("end", "11:00 AM"),
+        ]
+        base = parse_date("Aug 14, 2025 at 8 AM")
+
+        self.assert_matches_evaluate_schedule(
+            schedule,
+            base,
+            [
+                base,
+                parse_date("Aug 14, 2025 at 9 AM"),
+                parse_date("Aug 14, 2025 at 10 AM"),
+                parse_date("Aug 14, 2025 at 11 AM"),
+                parse_date("Aug 14, 2025 at 12 PM"),
+            ],
+        )
+
+    def test_timezone(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", "Aug 1 2025 9:00"),
+            ("end", "Aug 1 2025 17:00"),
+        ]
+        compiled = CompiledSchedule(
+            schedule, parse_date("Jan 1, 2025"), timezone="UTC+8"
+        )
+
+        assert compiled.evaluate(parse_date("Aug 1 2025 2:00")) == (
+            True,
+            parse_date("Aug 1 2025 9:00", timezone="UTC+8"),
+        )
+        assert compiled.evaluate(parse_date("Aug 1 2025 10:00")) == (
+            False,
+            parse_date("Aug 1 2025 17:00", timezone="UTC+8"),
+        )
+
+    def test_from_block(self) -> None:
+        block_data: BlockData = {
+            "title": "Test",
+            "notes": None,
+            "tags": None,
+            "tasks": None,
+            "timezone": "UTC-3",
+            "schedule": [("set", "Aug 1 2025"), ("end", "Aug 2 2025")],
+        }
+        compiled = CompiledSchedule.from_block(block_data, parse_date("Jan 1, 2025"))
+
+        assert compiled.evaluate(parse_date("Aug 1 2025 2:00")) == (False, None)
+        assert compiled.evaluate(parse_date("Aug 1 2025 3:00")) == (
+            True,
+            parse_date("Aug 1 2025", timezone="UTC-3"),
+        )
+
+
+class TestEvaluateScheduleMany:
+    def test_empty(self) -> None:
+        now = datetime.datetime.now()
+        assert evaluate_schedule_many([], [], relative_base=now) == ([], [])
+        assert evaluate_schedule_many([("set", None)], [now], relative_base=now) == (
+            [True],
+            [None],
+        )
+
+    def test_matches_evaluate_schedule(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", None),
+            ("end", "Aug 1 2025"),
+            ("set", "Aug 15 2025"),
+            ("end", "Sep 1 2025"),
+            ("set", "Sep 15 2025"),
+            ("end", "Aug 20 2025"),
+            ("set", None),
+        ]
+        base_date = parse_date("Jan 1, 2025")
+
+        # 6 hour slots over three months, deliberately out of order
+        evaluation_dates = [
+            parse_date("July 15, 2025") + datetime.timedelta(hours=6 * slot)
+            for slot in range(4 * 92)
+        ]
+        evaluation_dates.reverse()
+        evaluation_dates.append(parse_date("Aug 15 2025"))
+
+        evaluations, matched_dates = evaluate_schedule_many(
+            schedule, evaluation_dates, relative_base=base_date
+        )
+
+        assert len(evaluations) == len(matched_dates) == len(evaluation_dates)
+
+        for evaluation_date, evaluation, matched_date in zip(
+            evaluation_dates, evaluations, matched_dates
+        ):
+            assert (evaluation, matched_date) == evaluate_schedule(
+                schedule,
+                relative_base=base_date,
+                evaluation_date=evaluation_date,
+            )
+
+    def test_invalid_date(self) -> None:
+        now = datetime.datetime.now()
+        with pytest.raises(ValueError, match="Failed parsing 'every 6 months'"):
+            evaluate_schedule_many(
+                [("set", "every 6 months")], [now], relative_base=now
+            )
+
+
+class TestNextTransition:
+    def test_transitions_match_intervals(self) -> None:
+        """Transitions are walked lazily, yet agree with the interval pieces."""
+        schedule: list[ScheduleEntry] = [
+            ("set", "Jan 1 2025 9:00"),
+            ("end", "Jan 1 2025 9:00"),
+            ("set", "Mar 1 2025"),
+            ("end", "Feb 1 2025"),
+            ("end", "Apr 1 2025"),
+            ("set", None),
+        ]
+        compiled = CompiledSchedule(schedule, parse_date("Jan 1 2025"))
+
+        for month in range(1, 6):
+            after = parse_date(f"{month}/1/2025")
+            expected = []
+            evaluation = compiled.evaluate(after)[0]
+
+            for start, _, piece_evaluation, date in compiled._pieces():
+                if start is None or date is None or start <= to_timestamp(after):
+                    continue
+
+                if piece_evaluation != evaluation:
+                    evaluation = piece_evaluation
+                    expected.append({"date": date, "evaluation": evaluation})
+
+            assert list(compiled.transitions(after)) == expected
+
+    def test_no_transition(self) -> None:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+        assert next_transition([], after=now, relative_base=now) is None
+        assert next_transition([("set", None)], after=now, relative_base=now) is None
+
+    def test_transitions(self) -> None:
+        schedule: list[ScheduleEntry] = [
+            ("set", "9:00 AM"),
+            ("end", "11:00 AM"),
+        ]
+        base_date = parse_date("Aug 14, 2025 at 8 AM")
+
+        assert next_transition(schedule, after=base_date, relative_base=base_date) == {
+            "date": parse_date("Aug 14, 2025 at 9 AM"),
+            "evaluation": True,
+        }
+        assert next_transition(
+            schedule,
+            after=parse_date("Aug 14, 2025 at 9 AM"),
+            relative_base=base_date,
+        ) == {"date": parse_date("Aug 14, 2025 at 11 AM"), "evaluation": False}
+        assert (
+            next_transition(
+                schedule,
+                after=parse_date("Aug 14, 2025 at 11 AM"),
+                relative_base=base_date,
+            )
+            is None
+        )
+
+    def test_transition_after_instant(self) -> None:
+        """An open-ended entry flips the evaluation right after a dated one."""
+        schedule: list[ScheduleEntry] = [
+            ("set", None),
+            ("end", "Aug 1 2025"),
+            ("set", None),
+        ]
+        base_date = parse_date("Jan 1, 2025")
+        compiled = CompiledSchedule(schedule, base_date)
+
+        assert list(compiled.transitions(base_date)) == [
+            {"date": parse_date("Aug 1 2025"), "evaluation": False},
+            {
+                "date": parse_date("Aug 1 2025") + datetime.timedelta(microseconds=1),
+                "evaluation": True,
+            },
+        ]
+
+    def test_timezone(self) -> None:
+        base_date = parse_date("Jan 1, 2025")
+
+        assert next_transition(
+            [("end", None), ("set", "Aug 1 2025")],
+            after=base_date,
+            relative_base=base_date,
+            timezone="UTC+8",
+        ) == {"date": parse_date("Jul 31 2025 16:00"), "evaluation": True}
+
+
+class TestUpcomingTransitions:
+    def test_heap(self) -> None:
+        def block(schedule: list[ScheduleEntry]) -> BlockData:
+            return {
+                "title": "Test",
+                "notes": None,
+                "tags": None,
+                "tasks": None,
+                "timezone": None,
+                "schedule": schedule,
+            }
+
+        heap = upcoming_transitions(
+            {
+                "work": block([("set", "9:00 AM"), ("end", "5:00 PM")]),
+                "lunch": block([("set", "12:00 PM"), ("end", "1:00 PM")]),
+                "always": block([("set", None)]),
+            },
+            after=parse_date("Aug 14, 2025 at 10 AM"),
+            relative_base=parse_date("Aug 14, 2025 at 8 AM"),
+        )
+
+        assert [heapq.heappop(heap) for _ in range(len(heap))] == [
+            (parse_date("Aug 14, 2025 at 12 PM"), "lunch", True),
+            (parse_date("Aug 14, 2025 at 1 PM"), "lunch", False),
+            (parse_date("Aug 14, 2025 at 5 PM"), "work", False),
+        ]
+
+
+class TestLazyEvaluation:
+    def test_matches_evaluate_schedule(self) -> None:
+        base_date = parse_date("Jan 1 2025")
+        schedule: list[ScheduleEntry] = [
+            ("set", "Feb 1 2025 -> in 2 days"),
+            ("end", "Feb 10 2025 -> in 1 week -> in 12 hours"),
+            ("set", None),
+            ("end", "Mar 1 2025 -> 3 days ago"),
+            ("set", "Mar 1 2025 -> in 1 month"),
+        ]
+
+        for evaluation_date in [
+            "Jan 1 2025",
+            "Feb 3 2025",
+            "Feb 10 2025",
+            "Feb 17 2025 at 12 PM",
+            "Feb 26 2025",
+            "Mar 31 2025",
+            "Apr 1 2025",
+            "May 1 2025",
+        ]:
+            for timezone in [None, "UTC+8"]:
+                assert evaluate_schedule(
+                    schedule,
+                    relative_base=base_date,
+                    evaluation_date=parse_date(evaluation_date),
+                    timezone=timezone,
+                    lazy=True,
+                ) == evaluate_schedule(
+                    schedule,
+                    relative_base=base_date,
+                    evaluation_date=parse_date(evaluation_date),
+                    timezone=timezone,
+                )
+
+    def test_skips_forward_segments(self) -> None:
+        base_date = parse_date("Jan 1 2025")
+        schedule: list[ScheduleEntry] = [
+            ("set", "Feb 1 2025"),
+            ("end", "Mar 1 2025 -> in 100000 years"),
+        ]
+
+        assert evaluate_schedule(
+            schedule,
+            relative_base=base_date,
+            evaluation_date=parse_date("Feb 5 2025"),
+            lazy=True,
+        ) == (True, parse_date("Feb 1 2025"))
+
+        with pytest.raises(ValueError, match="Failed parsing"):
+            evaluate_schedule(
+                schedule,
+                relative_base=base_date,
+                evaluation_date=parse_date("Feb 5 2025"),
+            )
+
+    def test_parses_up_to_evaluation_date(self) -> None:
+        base_date = parse_date("Jan 1 2025")
+
+        with pytest.raises(ValueError, match="Failed parsing 'Jan 20 2025 -> bad'"):
+            evaluate_schedule(
+                [("set", "Jan 20 2025 -> bad")],
+                relative_base=base_date,
+                evaluation_date=parse_date("Feb 5 2025"),
+                lazy=True,
+            )
+
+
+class TestValidateSchedule:
+    def test_valid(self) -> None:
+        validate_schedule(
+            [("set", None), ("end", "Aug 1 2025 -> in 2 days")],
+            parse_date("Jan 1 2025"),
+        )
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match="Failed parsing 'in 100000 years'"):
+            validate_schedule(
+                [("set", "Aug 1 2025"), ("end", "in 100000 years")],
+                parse_date("Jan 1 2025"),
+            )
@@ -1,3 +1,4 @@
+import io
 import pytest
 from src.fields import split_fields
 
@@ -359,3 +360,53 @@ class TestSplitFields:
         assert len(fields) == 1
         assert fields[0]["key"].strip().lower() == "name"
         assert fields[0]["value"].strip() == "John"
+
+    def test_closing_quotes_on_their_own_line(self) -> None:
+        """The line range starts after the opening line when the closing quotes stand alone."""
+        code = 'tasks: """\nTask 1\nTask 2\n"""\nname: John'
+        fields = list(split_fields(code))
+
+        assert fields[0]["value"] == "\nTask 1\nTask 2\n"
+        assert fields[0]["line_no_range"] == (2, 4)
+        assert fields[0]["content"] == 'Task 1\nTask 2\n"""'
+        assert fields[1]["line_no_range"] == (5, 5)
+
+    def test_iterable_of_lines(self) -> None:
+        """Lines can be passed one by one, with or without line terminators."""
+        code = 'name: John\n\ndescription: """First\nSecond"""\ncity: Paris'
+        expected = list(split_fields(code))
+
+        assert list(split_fields(code.splitlines())) == expected
+        assert list(split_fields(code.splitlines(keepends=True))) == expected
+
+    def test_text_stream(self) -> None:
+        """Text streams are consumed lazily, line by line."""
+        stream = io.StringIO('name: John\ndescription: """First\nSecond"""\n')
+        fields = split_fields(stream)
+
+        assert next(fields)["line_no_range"] == (1, 1)
+        assert stream.tell() < len(stream.getvalue())
+        assert next(fields)["value"] == "First\nSecond"
+
+    def test_iterable_errors(self) -> None:
+        """Errors report the same line numbers for iterables."""
+        with pytest.raises(ValueError, match="in line 3"):
+            list(split_fields(["name: John", "", "invalid"]))
+
+        with pytest.raises(ValueError, match="Multiline field was not closed"):
+            list(split_fields(iter(['notes: """', "never closed"])))
+
+    def test_keys(self) -> None:
+        """Fields outside `keys` keep their key and lines but not their value."""
+        code = 'Name: John\ndescription: """First\nSecond"""\ncity: Paris'
+        expected = list(split_fields(code))
+        fields = list(split_fields(code, keys={"name", "city"}))
+
+        assert fields[0] == expected[0]
+        assert fields[1]["key"] == "description"
+        assert fields[1]["line_no_range"] == expected[1]["line_no_range"]
+        assert fields[1]["content"] == fields[1]["value"] == ""
+        assert fields[2] == expected[2]
+
+        with pytest.raises(ValueError, match="Multiline field was not closed"):
+            list(split_fields('notes: """\nnever closed', keys=set()))
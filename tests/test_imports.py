@@ -0,0 +1,78 @@
+import sys
+import json
+import pathlib
+import subprocess
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Generous enough for slow machines, while `dateparser` alone takes more
+IMPORT_BUDGET_US = 100_000
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def loaded_modules(code: str) -> set[str]:
+    result = run_python(
+        f"import sys, json\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    )
+    return set(json.loads(result.stdout))
+
+
+class TestLazyImports:
+    def test_import_is_light(self) -> None:
+        modules = loaded_modules(f"import {ROOT.name}")
+
+        assert "dateparser" not in modules
+        assert "dateutil" not in modules
+        assert f"{ROOT.name}.src.evaluator" not in modules
+
+    def test_parsing_does_not_load_dateparser(self) -> None:
+        modules = loaded_modules(
+            f"from {ROOT.name} import apply_variables, parse_code, split_fields\n"
+            "code = apply_variables('title: {title}\\nschedule: set Aug 1', {'title': 'x'})\n"
+            "parse_code(code, {})\n"
+            "list(split_fields(code))"
+        )
+
+        assert "dateparser" not in modules
+        assert "dateutil" not in modules
+
+    def test_parsing_dates_loads_dateparser(self) -> None:
+        modules = loaded_modules(
+            f"from {ROOT.name} import parse_date_string\n"
+            "assert parse_date_string('Aug 1 2025 at 9 AM') is not None\n"
+            "assert parse_date_string('tomorrow') is not None"
+        )
+
+        assert "dateparser" in modules
+
+    def test_exports(self) -> None:
+        result = run_python(
+            f"import {ROOT.name} as package\n"
+            "for name in package.__all__:\n"
+            "    assert getattr(package, name) is not None, name\n"
+            "print(len(package.__all__))"
+        )
+
+        assert int(result.stdout) > 0
+
+    def test_import_time_budget(self) -> None:
+        result = run_python(f"import {ROOT.name}", "-X", "importtime")
+
+        # Each line is `import time: self | cumulative | name`
+        for line in result.stderr.splitlines():
+            _, cumulative, name = line.split("|")
+
+            if name.strip() == ROOT.name:
+                assert int(cumulative) < IMPORT_BUDGET_US
+                break
+        else:
+            raise AssertionError("Package import not found in -X importtime output")
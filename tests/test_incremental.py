@@ -0,0 +1,109 @@
+import pytest
+from src.incremental import ParseState, TextEdit, parse_code_state, reparse_code
+from src.fields import split_fields
+from src.parser import parse_code
+
+CODE = '''Title: Focus {name}
+Notes: """
+Line 1
+Line 2
+"""
+Tags: deep, work
+Schedule: """
+set 9:00 AM
+end 11:00 AM
+"""'''
+
+
+def replace(state: ParseState, old: str, new: str) -> TextEdit:
+    start = state["code"].index(old)
+    return {"start": start, "end": start + len(old), "text": new}
+
+
+class TestParseCodeState:
+    def test_matches_parse_code(self) -> None:
+        state = parse_code_state(CODE, {"name": "A"})
+
+        assert state["block"] == parse_code(CODE, {"name": "A"})
+        assert state["fields"] == list(split_fields(CODE.replace("{name}", "A")))
+
+
+class TestReparseCode:
+    def test_edit_inside_field(self) -> None:
+        state = parse_code_state(CODE, {"name": "A"})
+        new_state = reparse_code(
+            state, replace(state, "Line 2", "Line 2\nLine 3"), {"name": "A"}
+        )
+        new_code = CODE.replace("Line 2", "Line 2\nLine 3")
+
+        assert new_state["code"] == new_code
+        assert new_state["block"] == parse_code(new_code, {"name": "A"})
+        assert new_state["fields"] == list(
+            split_fields(new_code.replace("{name}", "A"))
+        )
+
+        # The title is reused as is and the fields after the notes are shifted
+        assert new_state["fields"][0] is state["fields"][0]
+        assert new_state["partials"][2] is state["partials"][2]
+        assert new_state["fields"][2]["line_no_range"] == (7, 7)
+
+    def test_insert_and_remove_fields(self) -> None:
+        state = parse_code_state(CODE, {"name": "A"})
+        state = reparse_code(
+            state,
+            replace(state, "Tags: deep, work\n", "Tasks: one\nTimezone: UTC+8\n"),
+            {"name": "A"},
+        )
+        new_code = CODE.replace("Tags: deep, work\n", "Tasks: one\nTimezone: UTC+8\n")
+
+        assert state["block"] == parse_code(new_code, {"name": "A"})
+        assert state["block"]["tags"] is None
+        assert state["block"]["timezone"] == "UTC+8"
+
+        state = reparse_code(state, replace(state, "Tasks: one\n", ""), {"name": "A"})
+
+        assert state["block"] == parse_code(
+            new_code.replace("Tasks: one\n", ""), {"name": "A"}
+        )
+
+    def test_variables_change(self) -> None:
+        state = parse_code_state(CODE, {"name": "A"})
+        new_state = reparse_code(
+            state, {"start": 0, "end": 0, "text": ""}, {"name": "B"}
+        )
+
+        assert new_state["block"]["title"] == " Focus B"
+        assert new_state["partials"][1] is state["partials"][1]
+
+    def test_errors_match_full_parse(self) -> None:
+        state = parse_code_state(CODE, {"name": "A"})
+
+        for edit, message in [
+            (replace(state, "Line 1", "{missing}"), "Variable 'missing' is undefined"),
+            (replace(state, "Tags:", "Tags"), "missing a colon .* in line 6"),
+            (replace(state, "set 9:00", "start 9:00"), "Invalid action: start"),
+            (
+                replace(state, 'end 11:00 AM\n"""', "end"),
+                "Multiline field was not closed",
+            ),
+            (replace(state, "Title", "Name"), "Invalid key: 'Name'"),
+        ]:
+            new_code = (
+                state["code"][: edit["start"]]
+                + edit["text"]
+                + state["code"][edit["end"] :]
+            )
+
+            with pytest.raises(ValueError, match=message):
+                parse_code(new_code, {"name": "A"})
+
+            with pytest.raises(ValueError, match=message):
+                reparse_code(state, edit, {"name": "A"})
+
+    def test_missing_required_field(self) -> None:
+        state = parse_code_state(CODE, {"name": "A"})
+
+        with pytest.raises(ValueError, match="Missing required field: 'title'"):
+            reparse_code(
+                state, replace(state, "Title: Focus {name}\n", ""), {"name": "A"}
+            )
@@ -0,0 +1,119 @@
+import datetime
+from src.block import ScheduleEntry
+from src.evaluator import CompiledSchedule
+from src.index import ScheduleIndex
+from tests.utils import parse_date
+
+BASE_DATE = parse_date("Jan 1, 2025")
+
+SCHEDULES: dict[str, list[ScheduleEntry]] = {
+    "always": [("set", None)],
+    "never": [("end", None)],
+    "august": [("set", "Aug 1 2025"), ("end", "Sep 1 2025")],
+    "until_august": [("set", None), ("end", "Aug 1 2025")],
+    "from_september": [("end", None), ("set", "Sep 1 2025")],
+    "gap": [
+        ("set", None),
+        ("end", "Aug 10 2025"),
+        ("set", "Aug 20 2025"),
+        ("end", "Aug 25 2025"),
+        ("set", None),
+    ],
+    "instant": [("set", "Aug 15 2025"), ("end", "Aug 15 2025")],
+    "unordered": [("set", "Aug 20 2025"), ("end", "Aug 5 2025"), ("set", None)],
+}
+
+
+def build_index() -> ScheduleIndex:
+    index = ScheduleIndex()
+
+    for block_id, schedule in SCHEDULES.items():
+        index.insert(block_id, CompiledSchedule(schedule, BASE_DATE))
+
+    return index
+
+
+class TestScheduleIndex:
+    def test_matches_evaluate(self) -> None:
+        index = build_index()
+        compiled_schedules = {
+            block_id: CompiledSchedule(schedule, BASE_DATE)
+            for block_id, schedule in SCHEDULES.items()
+        }
+        dates = [
+            parse_date("Jul 31 2025") + datetime.timedelta(hours=12 * step)
+            for step in range(90)
+        ]
+        dates += [
+            parse_date("Aug 15 2025"),
+            parse_date("Aug 15 2025") + datetime.timedelta(microseconds=1),
+            parse_date("Aug 15 2025") - datetime.timedelta(microseconds=1),
+        ]
+
+        for date in dates:
+            assert index.active_at(date) == {
+                block_id
+                for block_id, compiled_schedule in compiled_schedules.items()
+                if compiled_schedule.evaluate(date)[0]
+            }
+
+    def test_unbounded_intervals(self) -> None:
+        index = build_index()
+
+        assert index.active_at(parse_date("Jan 1 1900")) == {
+            "always",
+            "until_august",
+            "gap",
+        }
+        assert index.active_at(parse_date("Jan 1 2100")) == {
+            "always",
+            "from_september",
+            "gap",
+            "unordered",
+        }
+
+    def test_instant(self) -> None:
+        index = build_index()
+
+        assert "instant" in index.active_at(parse_date("Aug 15 2025"))
+        assert "instant" not in index.active_at(
+            parse_date("Aug 15 2025") + datetime.timedelta(microseconds=1)
+        )
+
+    def test_remove(self) -> None:
+        index = build_index()
+        index.remove("always")
+        index.remove("missing")
+
+        assert len(index) == len(SCHEDULES) - 1
+        assert "always" not in index
+        assert index.active_at(parse_date("Jan 1 1900")) == {"until_august", "gap"}
+
+    def test_reinsert_replaces_intervals(self) -> None:
+        index = build_index()
+        index.insert(
+            "august",
+            CompiledSchedule([("set", "Oct 1 2025"), ("end", "Nov 1 2025")], BASE_DATE),
+        )
+
+        assert "august" not in index.active_at(parse_date("Aug 15 2025"))
+        assert "august" in index.active_at(parse_date("Oct 15 2025"))
+        assert len(index) == len(SCHEDULES)
+
+    def test_many_blocks(self) -> None:
+        index = ScheduleIndex()
+        compiled_schedules = {
+            str(day): CompiledSchedule(
+                [("set", f"Aug {day} 2025"), ("end", f"Aug {day + 3} 2025")],
+                BASE_DATE,
+            )
+            for day in range(1, 28)
+        }
+
+        for block_id, compiled_schedule in compiled_schedules.items():
+            index.insert(block_id, compiled_schedule)
+
+        for block_id in list(compiled_schedules)[::2]:
+            index.remove(block_id)
+
+        assert index.active_at(parse_date("Aug 10 2025 12:00")) == {"8", "10"}
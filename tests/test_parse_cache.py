@@ -0,0 +1,99 @@
+import pathlib
+import pytest
+from src.parser import parse_code
+from src.parse_cache import ParsedBlockCache, source_key
+
+CODE = '''Title: {name}
+Tags: work, deep
+Tasks: """
+Write tests
+Ship it
+"""
+Timezone: UTC+8
+Schedule: """
+set 9:00 AM
+end
+"""'''
+
+
+class TestSourceKey:
+    def test_variables_are_canonicalized(self) -> None:
+        assert source_key(CODE, {"a": "1", "b": "2"}) == source_key(
+            CODE, {"b": "2", "a": "1"}
+        )
+        assert source_key(CODE, {"a": "1"}) != source_key(CODE, {"a": "2"})
+        assert source_key(CODE, {}) != source_key(CODE + " ", {})
+
+    def test_cache_version(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        key = source_key(CODE, {"name": "x"})
+        monkeypatch.setattr("src.parse_cache.CACHE_VERSION", 2)
+
+        assert source_key(CODE, {"name": "x"}) != key
+
+
+class TestParsedBlockCache:
+    def test_memory_hits(self) -> None:
+        cache = ParsedBlockCache()
+
+        assert cache.parse_code(CODE, {"name": "A"}) == parse_code(CODE, {"name": "A"})
+        assert cache.parse_code(CODE, {"name": "A"}) == parse_code(CODE, {"name": "A"})
+        assert cache.parse_code(CODE, {"name": "B"})["title"] == " B"
+        assert (cache.memory.hits, cache.memory.misses) == (1, 2)
+
+    def test_returned_blocks_are_copies(self) -> None:
+        cache = ParsedBlockCache()
+        block_data = cache.parse_code(CODE, {"name": "A"})
+        assert block_data["tags"] is not None
+        block_data["tags"].add("mutated")
+        block_data["schedule"].clear()
+
+        assert cache.parse_code(CODE, {"name": "A"}) == parse_code(CODE, {"name": "A"})
+
+    def test_lru_eviction(self) -> None:
+        cache = ParsedBlockCache(maxsize=1)
+        cache.parse_code(CODE, {"name": "A"})
+        cache.parse_code(CODE, {"name": "B"})
+
+        assert len(cache.memory) == 1
+        assert cache.memory.evictions == 1
+
+    def test_errors_are_not_cached(self) -> None:
+        cache = ParsedBlockCache()
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Variable 'name' is undefined"):
+                cache.parse_code(CODE, {})
+
+        assert len(cache.memory) == 0
+
+    def test_persistence(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "blocks.sqlite"
+        cache = ParsedBlockCache(path=path)
+        expected = cache.parse_code(CODE, {"name": "A"})
+        cache.close()
+
+        restarted = ParsedBlockCache(path=path)
+        assert restarted.parse_code(CODE, {"name": "A"}) == expected
+        assert restarted.disk_hits == 1
+        assert restarted.parse_code(CODE, {"name": "A"}) == expected
+        assert restarted.disk_hits == 1
+
+        restarted.clear()
+        restarted.parse_code(CODE, {"name": "A"})
+        assert restarted.disk_hits == 0
+        restarted.close()
+
+    def test_other_versions_are_ignored(
+        self, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = tmp_path / "blocks.sqlite"
+        cache = ParsedBlockCache(path=path)
+        cache.parse_code(CODE, {"name": "A"})
+        cache.close()
+
+        monkeypatch.setattr("src.parse_cache.CACHE_VERSION", 2)
+        upgraded = ParsedBlockCache(path=path)
+        upgraded.parse_code(CODE, {"name": "A"})
+
+        assert upgraded.disk_hits == 0
+        upgraded.close()
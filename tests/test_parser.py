@@ -1,6 +1,14 @@
+import collections
 import pytest
 from src.fields import split_fields
-from src.parser import parse_field, parse_code
+from src.parser import (
+    FIELD_KEYS,
+    FIELD_VARIABLES_MIN_SIZE,
+    parse_field,
+    parse_code,
+    parse_fields,
+)
+from src.variables import apply_variables
 
 
 class TestParseField:
@@ -696,3 +704,154 @@ set
         assert block_data["tags"] == {"random", "order"}
         assert block_data["tasks"] == ["Random task"]
         assert block_data["schedule"] == [("set", "2025-01-01")]
+
+
+LARGE_NOTES = "\n".join(f"Note line {i}" for i in range(FIELD_VARIABLES_MIN_SIZE // 10))
+
+
+def large_code(title: str, date: str = "Aug 1") -> str:
+    return (
+        f"Title: {title}\n"
+        f'Notes: """\n{LARGE_NOTES}\n"""\n'
+        "Tags: work, {tag}\n"
+        f"Schedule: set {date}"
+    )
+
+
+def parse_whole_code(code: str, variables: dict[str, str]) -> object:
+    try:
+        return parse_fields(split_fields(apply_variables(code, variables)))
+    except ValueError as error:
+        return str(error)
+
+
+class TestFieldVariables:
+    def test_only_fields_with_placeholders_are_rendered(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("src.parser.apply_variables", None)
+        code = large_code("{title}", "{date}")
+        block_data = parse_code(code, {"title": "Big", "tag": "home", "date": "Aug 2"})
+
+        assert block_data["title"] == " Big"
+        assert block_data["notes"] == f"\n{LARGE_NOTES}\n"
+        assert block_data["tags"] == {"work", "home"}
+        assert block_data["schedule"] == [("set", "Aug 2")]
+
+    @pytest.mark.parametrize(
+        "title, variables",
+        [
+            ("{title}", {"title": "Big", "tag": "home"}),
+            ("{title:>8}|{title!r}", {"title": "Big", "tag": "home"}),
+            ("{{literal}} {title}", {"title": "Big", "tag": "home"}),
+            # Substituted values that change how the source splits
+            ("{title}", {"title": "Big\nNotes: other", "tag": "home"}),
+            ('{title}""', {"title": 'Big"', "tag": "home"}),
+            ("{title}", {"title": "", "tag": "home"}),
+            ('"""a"""{title}', {"title": " ", "tag": "home"}),
+            # Errors
+            ("{title}", {"tag": "home"}),
+            ("{title", {"title": "Big", "tag": "home"}),
+            ("{title}}", {"title": "Big"}),
+        ],
+    )
+    def test_matches_whole_source_rendering(
+        self, title: str, variables: dict[str, str]
+    ) -> None:
+        code = large_code(title)
+
+        try:
+            result: object = parse_code(code, variables)
+        except ValueError as error:
+            result = str(error)
+
+        assert result == parse_whole_code(code, variables)
+
+    def test_dict_subclass(self) -> None:
+        variables = collections.defaultdict(str, title="Big")
+
+        with pytest.raises(ValueError, match="Variable 'tag' is undefined"):
+            parse_code(large_code("{title}"), variables)
+
+    def test_placeholder_in_key(self) -> None:
+        code = large_code("Big").replace("Tags:", "{key}:")
+        variables = {"key": "Tasks", "tag": "home"}
+
+        assert parse_code(code, variables) == parse_whole_code(code, variables)
+        assert parse_code(code, variables)["tasks"] == [" work, home"]
+
+
+PROJECTION_CODE = (
+    "Title: {title}\n"
+    'Notes: """\nLong notes\n"""\n'
+    "Tags: work, deep\n"
+    'Tasks: """\nWrite tests\n"""\n'
+    "Timezone: Asia/Manila\n"
+    'Schedule: """\nset Aug 1 at 9 AM\nend Aug 1 at 5 PM\n"""'
+)
+
+
+class TestProjection:
+    @pytest.mark.parametrize(
+        "fields",
+        [
+            {"schedule", "timezone"},
+            {"title", "tags"},
+            {"notes"},
+            set(),
+            set(FIELD_KEYS),
+        ],
+    )
+    def test_matches_full_parse(self, fields: set[str]) -> None:
+        block_data = parse_code(PROJECTION_CODE, {"title": "Projected"})
+        partial_block_data = parse_code(
+            PROJECTION_CODE, {"title": "Projected"}, fields=fields
+        )
+
+        assert partial_block_data == {key: block_data[key] for key in fields}  # type: ignore[literal-required]
+
+    def test_missing_optional_field(self) -> None:
+        code = "Title: Minimal\nSchedule: set Aug 1"
+
+        assert parse_code(code, {}, fields=["tags", "schedule"]) == {
+            "tags": None,
+            "schedule": [("set", "Aug 1")],
+        }
+
+    def test_missing_required_field(self) -> None:
+        with pytest.raises(ValueError, match="Missing required field: 'title'"):
+            parse_code("Schedule: set Aug 1", {}, fields=["schedule"])
+
+        with pytest.raises(ValueError, match="Missing required field: 'schedule'"):
+            parse_code("Title: No schedule", {}, fields=["title"])
+
+    def test_invalid_key(self) -> None:
+        code = "Title: Test\nPriority: high\nSchedule: set Aug 1"
+
+        with pytest.raises(ValueError, match="Invalid key: 'Priority'"):
+            parse_code(code, {}, fields=["schedule"])
+
+    def test_invalid_field(self) -> None:
+        with pytest.raises(ValueError, match="Invalid field: 'priority'"):
+            parse_code(PROJECTION_CODE, {"title": "x"}, fields=["title", "priority"])
+
+    def test_fields_string(self) -> None:
+        with pytest.raises(TypeError, match="not a string"):
+            parse_code(PROJECTION_CODE, {"title": "x"}, fields="title")
+
+    def test_unrequested_values_are_not_parsed(self) -> None:
+        code = 'Title: Test\nSchedule: """\nrepeat Aug 1\n"""'
+
+        assert parse_code(code, {}, fields=["title"]) == {"title": " Test"}
+
+        with pytest.raises(ValueError, match="Invalid action: repeat"):
+            parse_code(code, {}, fields=["schedule"])
+
+    def test_large_source(self) -> None:
+        code = large_code("{title}")
+        variables = {"title": "Big", "tag": "home"}
+
+        assert parse_code(code, variables, fields=["title", "tags"]) == {
+            "title": " Big",
+            "tags": {"work", "home"},
+        }
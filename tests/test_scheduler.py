@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import datetime
+import pytest
+from src.block import BlockData, ScheduleEntry
+from src.scheduler import ManualClock, Scheduler
+from tests.utils import parse_date
+
+BASE_DATE = parse_date("Jan 1, 2025")
+
+
+def block(schedule: list[ScheduleEntry]) -> BlockData:
+    return {
+        "title": "Test",
+        "notes": None,
+        "tags": None,
+        "tasks": None,
+        "timezone": None,
+        "schedule": schedule,
+    }
+
+
+def build_scheduler(
+    clock: ManualClock,
+) -> tuple[Scheduler, list[tuple[str, str, datetime.datetime]]]:
+    events: list[tuple[str, str, datetime.datetime]] = []
+    scheduler = Scheduler(
+        on_set=lambda block_id, date: events.append(("set", block_id, date)),
+        on_end=lambda block_id, date: events.append(("end", block_id, date)),
+        clock=clock,
+    )
+    return scheduler, events
+
+
+class TestScheduler:
+    def test_fire_due(self) -> None:
+        clock = ManualClock(BASE_DATE)
+        scheduler, events = build_scheduler(clock)
+        scheduler.add("august", block([("set", "Aug 1 2025"), ("end", "Sep 1 2025")]))
+        scheduler.add("always", block([("set", None)]))
+        scheduler.add("instant", block([("set", "Aug 15 2025"), ("end", None)]))
+
+        assert scheduler.is_active("always")
+        assert not scheduler.is_active("august")
+        assert scheduler.next_due() == parse_date("Aug 1 2025")
+        assert scheduler.fire_due() == 0
+
+        clock.set(parse_date("Aug 20 2025"))
+
+        assert scheduler.fire_due() == 3
+        assert events == [
+            ("set", "august", parse_date("Aug 1 2025")),
+            ("set", "instant", parse_date("Aug 15 2025")),
+            (
+                "end",
+                "instant",
+                parse_date("Aug 15 2025") + datetime.timedelta(microseconds=1),
+            ),
+        ]
+        assert scheduler.is_active("august")
+        assert not scheduler.is_active("instant")
+
+        clock.set(parse_date("Dec 1 2025"))
+
+        assert scheduler.fire_due() == 1
+        assert events[-1] == ("end", "august", parse_date("Sep 1 2025"))
+        assert scheduler.next_due() is None
+
+    def test_update_and_remove(self) -> None:
+        clock = ManualClock(BASE_DATE)
+        scheduler, events = build_scheduler(clock)
+        scheduler.add("block", block([("set", "Aug 1 2025")]))
+        scheduler.add("other", block([("set", "Sep 1 2025")]))
+        scheduler.add("block", block([("set", "Oct 1 2025")]))
+
+        assert len(scheduler) == 2
+        assert scheduler.next_due() == parse_date("Sep 1 2025")
+
+        scheduler.remove("other")
+        scheduler.remove("missing")
+
+        assert "other" not in scheduler
+        assert scheduler.next_due() == parse_date("Oct 1 2025")
+
+        clock.set(parse_date("Dec 1 2025"))
+        scheduler.fire_due()
+
+        assert events == [("set", "block", parse_date("Oct 1 2025"))]
+
+    def test_update_changes_evaluation(self) -> None:
+        clock = ManualClock(BASE_DATE)
+        scheduler, events = build_scheduler(clock)
+        scheduler.add("block", block([("set", None)]))
+        scheduler.add("block", block([("set", None)]))
+        scheduler.add("block", block([("end", None)]))
+
+        assert events == [("end", "block", BASE_DATE)]
+
+    def test_many_updates(self) -> None:
+        clock = ManualClock(BASE_DATE)
+        scheduler, events = build_scheduler(clock)
+
+        for day in range(1, 29):
+            scheduler.add("block", block([("set", f"Feb {day} 2025")]))
+
+        assert len(scheduler._heap) < 28
+
+        clock.set(parse_date("Mar 1 2025"))
+        scheduler.fire_due()
+
+        assert events == [("set", "block", parse_date("Feb 28 2025"))]
+
+    def test_recompile_on_date_change(self) -> None:
+        clock = ManualClock(parse_date("Aug 1 2025 6:00"))
+        scheduler, events = build_scheduler(clock)
+        scheduler.add("block", block([("set", "9:00 AM"), ("end", "5:00 PM")]))
+
+        for date_string in ["Aug 1 2025 18:00", "Aug 2 2025 8:00", "Aug 2 2025 18:00"]:
+            clock.set(parse_date(date_string))
+            scheduler.fire_due()
+
+        assert events == [
+            ("set", "block", parse_date("Aug 1 2025 9:00")),
+            ("end", "block", parse_date("Aug 1 2025 17:00")),
+            ("set", "block", parse_date("Aug 2 2025 9:00")),
+            ("end", "block", parse_date("Aug 2 2025 17:00")),
+        ]
+        assert scheduler.next_due() == parse_date("Aug 3 2025")
+
+    def test_recompile_fires_changed_evaluation(self) -> None:
+        clock = ManualClock(parse_date("Aug 1 2025 6:00"))
+        scheduler, events = build_scheduler(clock)
+        scheduler.add(
+            "block", block([("set", "12:00 AM"), ("end", "12:00 AM -> in 8 hours")])
+        )
+
+        assert scheduler.is_active("block")
+
+        clock.set(parse_date("Aug 2 2025 1:00"))
+
+        assert scheduler.fire_due() == 2
+        assert events == [
+            ("end", "block", parse_date("Aug 1 2025 8:00")),
+            ("set", "block", parse_date("Aug 2 2025")),
+        ]
+        assert scheduler.is_active("block")
+
+    def test_recompile_after_last_transition(self) -> None:
+        clock = ManualClock(parse_date("Aug 1 2025 6:00"))
+        scheduler, events = build_scheduler(clock)
+        scheduler.add("block", block([("set", "in 1 hour"), ("end", "in 2 hours")]))
+        clock.set(parse_date("Aug 1 2025 12:00"))
+
+        assert scheduler.fire_due() == 6
+        assert [(action, date.hour) for action, _, date in events] == [
+            ("set", 7),
+            ("end", 8),
+            ("set", 9),
+            ("end", 10),
+            ("set", 11),
+            ("end", 12),
+        ]
+
+    def test_fixed_relative_base_is_not_recompiled(self) -> None:
+        clock = ManualClock(parse_date("Aug 1 2025 6:00"))
+        scheduler, events = build_scheduler(clock)
+        scheduler.add(
+            "block",
+            block([("set", "9:00 AM"), ("end", "in 1 hour")]),
+            relative_base=parse_date("Aug 1 2025 6:00"),
+        )
+        clock.set(parse_date("Aug 3 2025"))
+
+        assert scheduler.fire_due() == 2
+        assert scheduler.next_due() is None
+
+    def test_run(self) -> None:
+        clock = ManualClock(BASE_DATE)
+        scheduler, events = build_scheduler(clock)
+
+        async def main() -> None:
+            task = asyncio.create_task(scheduler.run())
+            scheduler.add("block", block([("set", "Aug 1 2025"), ("end", None)]))
+            await asyncio.sleep(0)
+
+            clock.set(parse_date("Jul 1 2025"))
+            await asyncio.sleep(0)
+
+            assert events == []
+
+            clock.set(parse_date("Aug 2 2025"))
+
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            task.cancel()
+
+        asyncio.run(main())
+
+        assert events == [
+            ("set", "block", parse_date("Aug 1 2025")),
+            (
+                "end",
+                "block",
+                parse_date("Aug 1 2025") + datetime.timedelta(microseconds=1),
+            ),
+        ]
+
+    def test_failing_callback(self) -> None:
+        clock = ManualClock(BASE_DATE)
+        events: list[tuple[str, datetime.datetime]] = []
+        errors: list[tuple[str, datetime.datetime, Exception]] = []
+
+        def on_set(block_id: str, date: datetime.datetime) -> None:
+            if block_id == "failing":
+                raise RuntimeError("Callback failed")
+
+            events.append((block_id, date))
+
+        scheduler = Scheduler(
+            on_set=on_set,
+            on_end=lambda block_id, date: None,
+            on_error=lambda block_id, date, error: errors.append(
+                (block_id, date, error)
+            ),
+            clock=clock,
+        )
+        scheduler.add("failing", block([("end", None), ("set", "Aug 1 2025")]))
+        scheduler.add("later", block([("end", None), ("set", "Aug 2 2025")]))
+
+        async def main() -> None:
+            task = asyncio.create_task(scheduler.run())
+            await asyncio.sleep(0)
+            clock.set(parse_date("Aug 1 2025"))
+            await asyncio.sleep(0)
+            clock.set(parse_date("Aug 3 2025"))
+
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            assert not task.done()
+            task.cancel()
+
+        asyncio.run(main())
+
+        assert events == [("later", parse_date("Aug 2 2025"))]
+        assert [(block_id, date) for block_id, date, _ in errors] == [
+            ("failing", parse_date("Aug 1 2025"))
+        ]
+        assert str(errors[0][2]) == "Callback failed"
+        assert scheduler.is_active("failing")
+
+    def test_failing_callback_is_logged(self, caplog: pytest.LogCaptureFixture) -> None:
+        clock = ManualClock(BASE_DATE)
+
+        def on_set(block_id: str, date: datetime.datetime) -> None:
+            raise RuntimeError("Callback failed")
+
+        scheduler = Scheduler(on_set=on_set, on_end=on_set, clock=clock)
+        scheduler.add("block", block([("set", "Aug 1 2025"), ("end", None)]))
+        clock.set(parse_date("Aug 2 2025"))
+
+        with caplog.at_level(logging.ERROR, logger="src.scheduler"):
+            assert scheduler.fire_due() == 2
+
+        assert len(caplog.records) == 2
+        assert "'block'" in caplog.records[0].getMessage()
@@ -1,5 +1,18 @@
+import collections
+from typing import Any, Callable
 import pytest
-from src.variables import apply_variables
+from src.parser import parse_code
+from src.variables import (
+    LazyVariables,
+    VariableIndex,
+    apply_variables,
+    compile_template,
+    get_template,
+    referenced_variables,
+    render,
+    render_many,
+    template_cache,
+)
 
 
 class TestApplyVariables:
@@ -22,3 +35,202 @@ class TestApplyVariables:
 
         with pytest.raises(ValueError, match="Variable 'title' is undefined"):
             apply_variables(code, {})
+
+
+class TestTemplate:
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "Title: {title}\nSchedule: set {date}",
+            "No placeholders",
+            "",
+            "{title}",
+            "{{escaped}} {title} {{",
+            "{title:>12}|{date!r}|{date!s:^20}",
+            "{title:{width}}",
+            "{date[0]} {date.upper}",
+        ],
+    )
+    def test_render_matches_apply_variables(self, code: str) -> None:
+        variables = {"title": "Test title", "date": "Aug 1", "width": "14"}
+
+        assert render(compile_template(code), variables) == apply_variables(
+            code, variables
+        )
+
+    def test_render_undefined_variable(self) -> None:
+        template = compile_template("Title: {title}\nSchedule: set {date}")
+
+        with pytest.raises(ValueError, match="Variable 'title' is undefined"):
+            render(template, {"date": "Aug 1"})
+
+        with pytest.raises(ValueError, match="Variable 'date' is undefined"):
+            render(template, {"title": "Test title"})
+
+    def test_render_undefined_variable_in_complex_field(self) -> None:
+        template = compile_template("{title:>{width}}")
+
+        with pytest.raises(ValueError, match="Variable 'width' is undefined"):
+            render(template, {"title": "Test title"})
+
+    @pytest.mark.parametrize("code", ["Title: {title", "Title: }", "{title!x}"])
+    def test_render_syntax_error(self, code: str) -> None:
+        template = compile_template(code)
+
+        with pytest.raises(ValueError) as expected:
+            apply_variables(code, {"title": "Test title"})
+
+        with pytest.raises(ValueError, match=str(expected.value)):
+            render(template, {"title": "Test title"})
+
+    def test_render_dict_subclass(self) -> None:
+        variables = collections.defaultdict(str, title="Test title")
+
+        with pytest.raises(ValueError, match="Variable 'notes' is undefined"):
+            apply_variables("Title: {title}{notes}", variables)
+
+        with pytest.raises(ValueError, match="Variable 'notes' is undefined"):
+            render(compile_template("Title: {title}{notes}"), variables)
+
+    def test_render_positional_field(self) -> None:
+        with pytest.raises(IndexError):
+            render(compile_template("Title: {}"), {"title": "Test title"})
+
+    def test_render_many(self) -> None:
+        template = compile_template("Title: {title}")
+        variable_sets = [{"title": str(i)} for i in range(3)]
+
+        assert render_many(template, variable_sets) == [
+            "Title: 0",
+            "Title: 1",
+            "Title: 2",
+        ]
+
+    def test_render_many_undefined_variable(self) -> None:
+        template = compile_template("Title: {title}")
+
+        with pytest.raises(ValueError, match="Variable 'title' is undefined"):
+            render_many(template, [{"title": "Test title"}, {}])
+
+    def test_render_non_string_values(self) -> None:
+        code = "Title: {title} {count}"
+        variables: dict[str, Any] = {"title": "Test title", "count": 3}
+
+        assert render(compile_template(code), variables) == "Title: Test title 3"
+
+
+class TestReferencedVariables:
+    def test_referenced_variables(self) -> None:
+        code = "Title: {title}\nNotes: {{literal}} {notes!r} {tags[0]} {tz.upper}"
+
+        assert referenced_variables(code) == {"title", "notes", "tags", "tz"}
+
+    def test_nested_format_spec(self) -> None:
+        assert referenced_variables("{title:>{width}}") == {"title", "width"}
+
+    def test_positional_fields_are_not_variables(self) -> None:
+        assert referenced_variables("{} {0} {title}") == {"title"}
+
+    def test_syntax_error(self) -> None:
+        # Rendering fails at the stray brace, after looking up `title`
+        assert referenced_variables("Title: {title} } {notes}") == {"title"}
+
+    def test_cached_by_source(self) -> None:
+        code = "Title: {title} {cached}"
+        template = get_template(code)
+        hits = template_cache.hits
+
+        assert get_template("".join(code)) is template
+        assert referenced_variables(code) == {"title", "cached"}
+        assert template_cache.hits == hits + 2
+
+
+class TestLazyVariables:
+    def test_only_referenced_variables_are_loaded(self) -> None:
+        loads: list[str] = []
+
+        def loader(name: str) -> Callable[[], str]:
+            def load() -> str:
+                loads.append(name)
+                return name.upper()
+
+            return load
+
+        variables = LazyVariables({name: loader(name) for name in ("a", "b", "c")})
+
+        assert apply_variables("{a} {b} {a}", variables) == "A B A"
+        assert apply_variables("{b:>2}", variables) == " B"
+        assert loads == ["a", "b"]
+        assert variables.loaded == {"a", "b"}
+        assert set(variables) == {"a", "b", "c"}
+        assert len(variables) == 3
+
+    def test_undefined_variable(self) -> None:
+        variables = LazyVariables({"title": lambda: "Test title"})
+
+        with pytest.raises(ValueError, match="Variable 'notes' is undefined"):
+            apply_variables("Title: {title}\nNotes: {notes}", variables)
+
+    def test_parse_code(self) -> None:
+        def unused() -> str:
+            raise AssertionError("Loaded an unreferenced variable")
+
+        variables = LazyVariables({"title": lambda: "Test title", "unused": unused})
+        block_data = parse_code("Title: {title}\nSchedule: set Aug 1", variables)
+
+        assert block_data["title"] == " Test title"
+        assert variables.loaded == {"title"}
+
+
+class TestVariableIndex:
+    def build_index(self) -> VariableIndex:
+        index = VariableIndex()
+        index.insert("a", "Title: {name}\nNotes: {notes}")
+        index.insert("b", "Title: {name:>{width}}")
+        index.insert("c", "Title: Plain")
+        return index
+
+    def test_invalidate_variable(self) -> None:
+        index = self.build_index()
+
+        assert index.invalidate_variable("name") == {"a", "b"}
+        assert index.invalidate_variable("notes") == {"a"}
+        assert index.invalidate_variable("width") == {"b"}
+        assert index.invalidate_variable("other") == set()
+        assert len(index) == 3
+        assert "c" in index
+        assert index.variables_of("c") == set()
+
+    def test_insert_replaces_source(self) -> None:
+        index = self.build_index()
+        index.insert("a", "Title: {title}")
+
+        assert index.invalidate_variable("name") == {"b"}
+        assert index.invalidate_variable("notes") == set()
+        assert index.invalidate_variable("title") == {"a"}
+        assert index.variables_of("a") == {"title"}
+
+    def test_remove(self) -> None:
+        index = self.build_index()
+        index.remove("b")
+        index.remove("missing")
+
+        assert index.invalidate_variable("name") == {"a"}
+        assert index.invalidate_variable("width") == set()
+        assert "b" not in index
+        assert len(index) == 2
+
+    def test_matches_referenced_variables(self) -> None:
+        index = self.build_index()
+        sources = {
+            "a": "Title: {name}\nNotes: {notes}",
+            "b": "Title: {name:>{width}}",
+            "c": "Title: Plain",
+        }
+
+        for name in ("name", "notes", "width"):
+            assert index.invalidate_variable(name) == {
+                block_id
+                for block_id, code in sources.items()
+                if name in referenced_variables(code)
+            }
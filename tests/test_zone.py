@@ -0,0 +1,55 @@
+import datetime
+from src.date import parse_date_string
+from src.evaluator import CompiledSchedule, evaluate_schedule
+from src.zone import Zone, get_zone
+from tests.utils import parse_date
+
+
+class TestGetZone:
+    def test_interned(self) -> None:
+        assert get_zone("Asia/Tokyo") is get_zone("Asia/Tokyo")
+        assert get_zone("Asia/Tokyo") is not get_zone("UTC+8")
+
+    def test_default(self) -> None:
+        assert get_zone(None) is get_zone("UTC")
+        assert get_zone("") is get_zone("UTC")
+        assert get_zone(None).name == "UTC"
+
+    def test_passthrough(self) -> None:
+        zone = get_zone("Europe/London")
+
+        assert get_zone(zone) is zone
+
+    def test_tzinfo(self) -> None:
+        zone = get_zone("Asia/Tokyo")
+        date = datetime.datetime(2025, 8, 1, tzinfo=datetime.timezone.utc)
+
+        assert isinstance(zone, Zone)
+        assert zone.tzinfo is not None
+        assert date.astimezone(zone.tzinfo).utcoffset() == datetime.timedelta(hours=9)
+
+
+class TestZoneHandles:
+    def test_parse_date_string(self) -> None:
+        base = parse_date("Aug 10 2025")
+
+        for timezone in ["UTC+8", "America/New_York", "Asia/Kolkata"]:
+            for date_string in ["Aug 1 2025", "tomorrow at 5 PM", "in 2 days"]:
+                assert parse_date_string(
+                    date_string, base, timezone=get_zone(timezone)
+                ) == parse_date_string(date_string, base, timezone=timezone)
+
+    def test_evaluator(self) -> None:
+        zone = get_zone("UTC+8")
+        base = parse_date("Jan 1 2025")
+        evaluation_date = parse_date("Aug 1 2025 12:00")
+
+        assert evaluate_schedule(
+            [("set", "Aug 1 2025")],
+            relative_base=base,
+            evaluation_date=evaluation_date,
+            timezone=zone,
+        ) == (True, parse_date("Aug 1 2025", timezone="UTC+8"))
+        assert CompiledSchedule([("set", "Aug 1 2025")], base, timezone=zone).evaluate(
+            evaluation_date
+        ) == (True, parse_date("Aug 1 2025", timezone="UTC+8"))